@@ -0,0 +1,105 @@
+"""
+Shared pytest fixtures for the BVCU test suites
+"""
+
+import io
+import os
+import tarfile
+import tempfile
+
+import pytest
+
+from text_to_speech import BVCUTextToSpeech, get_engine
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "slow: stress tests with many iterations (deselect with -m 'not slow')"
+    )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def voice_cache_home(tmp_path_factory):
+    """Point $XDG_CACHE_HOME at a session directory
+
+    Voice selections are remembered there (see text_to_speech._voice_cache_path),
+    so the tests neither read nor write the user's own cache.
+    """
+    cache_home = tmp_path_factory.mktemp("xdg_cache")
+    previous = os.environ.get('XDG_CACHE_HOME')
+    os.environ['XDG_CACHE_HOME'] = str(cache_home)
+    yield cache_home
+    if previous is None:
+        del os.environ['XDG_CACHE_HOME']
+    else:
+        os.environ['XDG_CACHE_HOME'] = previous
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """The shared pyttsx3 engine from get_engine(), started on first use
+
+    Tests that need speech synthesis request it (directly or through
+    usefixtures); they are skipped when the engine cannot start. Evaluated
+    once per session, and only if such a test runs.
+    """
+    try:
+        return get_engine()
+    except Exception:
+        pytest.skip("eSpeak/pyttsx3 engine is not installed")
+
+
+@pytest.fixture(scope="session")
+def tts_fr():
+    """One French instance on the ./voices directory, shared by the whole session
+
+    Scanning the voices directory is paid once instead of once per test, and
+    eSpeak is only initialized if a test actually touches the engine. Tests
+    must treat it as read-only.
+    """
+    return BVCUTextToSpeech("voices", "fr", lazy_engine=True)
+
+
+@pytest.fixture(scope="session")
+def empty_voice_dir():
+    """An empty voices directory shared by the session, in RAM where possible
+
+    Created under /dev/shm when it exists so that scanning it never touches
+    a disk. Tests must not create files in it.
+    """
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else None
+    with tempfile.TemporaryDirectory(dir=base) as tmpdir:
+        yield tmpdir
+
+
+# Standard BVCU test corpus: one file of each kind with small sample contents
+BVCU_CORPUS = {
+    'frf.bnx': b'BVCU voice data sample',
+    'frf.dca': b'BVCU dictionary',
+    'frf.ldi': b'BVCU linguistic',
+    'frf.oso': b'BVCU orthographic',
+    'frf.trz': b'BVCU transcription',
+    'user.userdico': 'test=test'.encode('utf-8'),
+}
+
+
+@pytest.fixture(scope="session")
+def bvcu_corpus_tar(tmp_path_factory):
+    """Path of a tar archive holding BVCU_CORPUS, built once per session"""
+    tar_path = tmp_path_factory.mktemp("bvcu_corpus") / "corpus.tar"
+    with tarfile.open(tar_path, "w") as tar:
+        for name, data in BVCU_CORPUS.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return tar_path
+
+
+@pytest.fixture
+def bvcu_corpus_dir(tmp_path, bvcu_corpus_tar):
+    """Fresh per-test directory populated with the standard BVCU corpus"""
+    # Trusted archive built above; the 'data' filter is used where available
+    extract_args = {'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}
+    with tarfile.open(bvcu_corpus_tar) as tar:
+        tar.extractall(tmp_path, **extract_args)
+    return tmp_path
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Prebuild the BVCU voice cache
+
+Runs the voice file selection once (largest voice data file wins, dictionaries
+are concatenated) and writes the selected blobs back to back into
+<voices>/.prebuilt.bin, with a JSON index of their offsets in
+<voices>/.prebuilt.idx. BVCUTextToSpeech memory-maps that file instead of
+opening every voice file, as long as the source files are unchanged.
+
+Usage:
+    python3 prebuild_voices.py [-v VOICE_PATH]
+"""
+
+import os
+import sys
+import argparse
+import json
+from pathlib import Path
+
+from text_to_speech import (
+    BVCUTextToSpeech, PREBUILT_DATA, PREBUILT_INDEX, _CompositeBlob, _log_to_stdout,
+    _source_signature, _stream_blob
+)
+
+
+def prebuild(voice_path):
+    """
+    Write the prebuilt voice cache for a voices directory
+    
+    Args:
+        voice_path (str): Path to directory containing voice files
+        
+    Returns:
+        bool: True if the cache was written
+    """
+    voice_path = Path(voice_path)
+    tts = BVCUTextToSpeech(voice_path, lazy_engine=True)
+    if not tts.voice_files:
+        print(f"Error: No BVCU voice files found in: {voice_path}")
+        return False
+    
+    blobs = [(key, tts.bvcu_data[key]) for key in ('voice_data', 'dictionary', 'linguistic')]
+    blobs += [(f"configuration/{name}", blob) for name, blob in tts.bvcu_data['configuration'].items()
+              if name != 'user_dictionary']
+    
+    data_path = voice_path / PREBUILT_DATA
+    index_path = voice_path / PREBUILT_INDEX
+    tmp_data_path = data_path.with_name(data_path.name + '.tmp')
+    tmp_index_path = index_path.with_name(index_path.name + '.tmp')
+    
+    index = {'sources': _source_signature(tts.voice_files), 'blobs': {}}
+    # Unbuffered: blobs are copied straight from the source files to the fd
+    with open(tmp_data_path, 'wb', buffering=0) as out:
+        for key, blob in blobs:
+            if blob is None:
+                continue
+            # One [offset, length] range per source file, so a combined
+            # dictionary is loaded back with its parts
+            ranges = index['blobs'][key] = []
+            for part in (blob.parts if isinstance(blob, _CompositeBlob) else [blob]):
+                ranges.append([out.tell(), len(part)])
+                _stream_blob(part, out.fileno())
+        index['data_size'] = out.tell()
+    with open(tmp_index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    
+    # Replace the data first: an old index left next to new data fails its size check
+    os.replace(tmp_data_path, data_path)
+    os.replace(tmp_index_path, index_path)
+    
+    print(f"✓ Prebuilt voice cache written to: {data_path} ({index['data_size']:,} bytes, "
+          f"{len(index['blobs'])} blobs)")
+    return True
+
+
+def main(argv=None):
+    """Main entry point for the prebuild script"""
+    parser = argparse.ArgumentParser(description='Prebuild the BVCU voice cache')
+    parser.add_argument(
+        '-v', '--voice-path',
+        type=str,
+        default='./voices',
+        help='Path to directory containing voice files (default: ./voices)'
+    )
+    args = parser.parse_args(argv)
+    with _log_to_stdout():
+        return 0 if prebuild(args.voice_path) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,240 +7,342 @@ into memory. However, the actual TTS synthesis uses pyttsx3/eSpeak and cannot
 use BVCU data (proprietary format requiring Nuance Vocalizer SDK).
 """
 
+import hashlib
+import json
+import logging
 import os
 import sys
-import tempfile
 from pathlib import Path
-from text_to_speech import BVCUTextToSpeech
 
+import pytest
 
-def test_no_bvcu_files():
+import text_to_speech
+from text_to_speech import BVCUTextToSpeech, DIGEST_CACHE, PREBUILT_DATA, PREBUILT_INDEX
+from prebuild_voices import prebuild
+
+_RULE = "=" * 60
+
+
+def test_no_bvcu_files(empty_voice_dir):
     """Test when no BVCU files are present"""
-    print("\n" + "=" * 60)
-    print("TEST 1: No BVCU files present")
-    print("=" * 60)
-    
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tts = BVCUTextToSpeech(tmpdir, 'fr')
-        
-        assert len(tts.voice_files) == 0, "Should find no voice files"
-        assert tts.bvcu_data['voice_data'] is None, "Should have no voice data"
-        assert tts.bvcu_data['dictionary'] is None, "Should have no dictionary"
-        assert tts.bvcu_data['linguistic'] is None, "Should have no linguistic data"
-        
-        print("✓ TEST PASSED: Correctly handles absence of BVCU files")
-        return True
-
-
-def test_with_bvcu_files():
+    print(f"\n{_RULE}\nTEST 1: No BVCU files present\n{_RULE}")
+    
+    tts = BVCUTextToSpeech(empty_voice_dir, 'fr', lazy_engine=True)
+    
+    assert len(tts.voice_files) == 0, "Should find no voice files"
+    assert tts.bvcu_data['voice_data'] is None, "Should have no voice data"
+    assert tts.bvcu_data['dictionary'] is None, "Should have no dictionary"
+    assert tts.bvcu_data['linguistic'] is None, "Should have no linguistic data"
+    
+    print("✓ TEST PASSED: Correctly handles absence of BVCU files")
+
+
+def test_without_voice_path():
+    """Test that voice file detection is skipped when no voices directory is given"""
+    print(f"\n{_RULE}\nTEST 1b: No voices directory\n{_RULE}")
+    
+    tts = BVCUTextToSpeech(None, 'fr', lazy_engine=True)
+    
+    assert tts.voice_path is None, "Should have no voices directory"
+    assert tts.voice_files == {}, "Should find no voice files"
+    assert tts.bvcu_data is None, "Should load no BVCU data"
+    assert tts.files_count == 0 and tts.voice_data_size == 0, "Sizes should be zero"
+    assert tts.user_dictionary is None, "Should have no user dictionary"
+    tts.close()
+    
+    print("✓ TEST PASSED: Voice file detection is skipped without a voices directory")
+
+
+def test_with_bvcu_files(bvcu_corpus_dir):
     """Test when BVCU files are present"""
-    print("\n" + "=" * 60)
-    print("TEST 2: BVCU files present")
-    print("=" * 60)
-    
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir_path = Path(tmpdir)
-        
-        # Create sample BVCU files
-        (tmpdir_path / 'frf.bnx').write_bytes(b'BVCU voice data sample')
-        (tmpdir_path / 'frf.dca').write_bytes(b'BVCU dictionary')
-        (tmpdir_path / 'frf.ldi').write_bytes(b'BVCU linguistic')
-        (tmpdir_path / 'frf.oso').write_bytes(b'BVCU orthographic')
-        (tmpdir_path / 'frf.trz').write_bytes(b'BVCU transcription')
-        (tmpdir_path / 'user.userdico').write_text('test=test', encoding='utf-8')
-        
-        tts = BVCUTextToSpeech(tmpdir, 'fr')
-        
-        # Verify files were detected
-        assert len(tts.voice_files) == 6, f"Should find 6 voice files, found {len(tts.voice_files)}"
-        
-        # Verify data was loaded
-        assert tts.bvcu_data['voice_data'] is not None, "Should have voice data"
-        assert len(tts.bvcu_data['voice_data']) > 0, "Voice data should be loaded"
-        
-        assert tts.bvcu_data['dictionary'] is not None, "Should have dictionary"
-        assert len(tts.bvcu_data['dictionary']) > 0, "Dictionary should be loaded"
-        
-        assert tts.bvcu_data['linguistic'] is not None, "Should have linguistic data"
-        assert len(tts.bvcu_data['linguistic']) > 0, "Linguistic data should be loaded"
-        
-        assert 'user_dictionary' in tts.bvcu_data['configuration'], "Should have user dictionary"
-        assert tts.bvcu_data['configuration']['user_dictionary'] == 'test=test', "User dict content mismatch"
-        
-        assert 'frf.oso' in tts.bvcu_data['configuration'], "Should have orthographic config"
-        assert 'frf.trz' in tts.bvcu_data['configuration'], "Should have transcription config"
-        
-        print("✓ TEST PASSED: Correctly loads BVCU files (detection only)")
-        return True
-
-
-def test_hd_voice_priority():
+    print(f"\n{_RULE}\nTEST 2: BVCU files present\n{_RULE}")
+    
+    # Sample BVCU files come from the standard test corpus (see conftest.py)
+    tts = BVCUTextToSpeech(bvcu_corpus_dir, 'fr', lazy_engine=True)
+    
+    # Verify files were detected
+    assert len(tts.voice_files) == 6, "Should find 6 voice files"
+    
+    # Verify data was loaded
+    assert tts.bvcu_data['voice_data'] is not None, "Should have voice data"
+    assert len(tts.bvcu_data['voice_data']) > 0, "Voice data should be loaded"
+    
+    assert tts.bvcu_data['dictionary'] is not None, "Should have dictionary"
+    assert len(tts.bvcu_data['dictionary']) > 0, "Dictionary should be loaded"
+    
+    assert tts.bvcu_data['linguistic'] is not None, "Should have linguistic data"
+    assert len(tts.bvcu_data['linguistic']) > 0, "Linguistic data should be loaded"
+    
+    assert 'user_dictionary' in tts.bvcu_data['configuration'], "Should have user dictionary"
+    assert not tts.bvcu_data['configuration']['user_dictionary'].loaded, "User dict should be read on demand"
+    assert tts.user_dictionary == 'test=test', "User dict content mismatch"
+    
+    assert 'frf.oso' in tts.bvcu_data['configuration'], "Should have orthographic config"
+    assert 'frf.trz' in tts.bvcu_data['configuration'], "Should have transcription config"
+    
+    print("✓ TEST PASSED: Correctly loads BVCU files (detection only)")
+
+
+def test_loading_reports_through_logging(bvcu_corpus_dir, capsys, caplog):
+    """Test that detection and loading report through the 'bvcu' logger, not stdout"""
+    print(f"\n{_RULE}\nTEST 2b: Loading messages are logged\n{_RULE}")
+    capsys.readouterr()
+    
+    with caplog.at_level(logging.INFO, logger='bvcu'):
+        BVCUTextToSpeech(bvcu_corpus_dir, 'fr', lazy_engine=True)
+    
+    assert capsys.readouterr().out == "", "Loading should not print"
+    assert "✓ Total: 6 BVCU voice files detected" in caplog.text, "Scan summary not logged"
+    assert "✓ Loaded voice data from frf.bnx (22 bytes)" in caplog.text, "Voice data not logged"
+    
+    print("✓ TEST PASSED: Loading messages go through logging")
+
+
+def test_hd_voice_priority(tmp_path):
     """Test that HD voice data takes priority over standard voice data"""
-    print("\n" + "=" * 60)
-    print("TEST 3: HD voice data priority")
-    print("=" * 60)
-    
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir_path = Path(tmpdir)
-        
-        # Create both standard and HD voice files
-        (tmpdir_path / 'frf.bnx').write_bytes(b'Standard voice')
-        (tmpdir_path / 'frf_hd.bnx').write_bytes(b'High definition voice data')
-        
-        tts = BVCUTextToSpeech(tmpdir, 'fr')
-        
-        # Verify HD voice data was used (it's larger)
-        assert tts.bvcu_data['voice_data'] is not None, "Should have voice data"
-        assert len(tts.bvcu_data['voice_data']) == 26, "Should use HD voice data (26 bytes)"
-        
-        print("✓ TEST PASSED: HD voice data takes priority")
-        return True
-
-
-def test_multiple_dictionaries():
+    print(f"\n{_RULE}\nTEST 3: HD voice data priority\n{_RULE}")
+    
+    # Create both standard and HD voice files
+    (tmp_path / 'frf.bnx').write_bytes(b'Standard voice')
+    (tmp_path / 'frf_hd.bnx').write_bytes(b'High definition voice data')
+    
+    tts = BVCUTextToSpeech(tmp_path, 'fr', lazy_engine=True)
+    
+    # Verify HD voice data was used (it's larger)
+    assert tts.bvcu_data['voice_data'] is not None, "Should have voice data"
+    assert len(tts.bvcu_data['voice_data']) == 26, "Should use HD voice data (26 bytes)"
+    
+    # Priority is decided from the recorded sizes: neither file is read
+    assert tts.bvcu_data['voice_data'] is tts.voice_files['frf_hd.bnx'], "Should select frf_hd.bnx"
+    assert not tts.voice_files['frf.bnx'].loaded, "The smaller file should not be read"
+    assert not tts.voice_files['frf_hd.bnx'].loaded, "The winner is only read on demand"
+    
+    print("✓ TEST PASSED: HD voice data takes priority")
+
+
+def test_multiple_dictionaries(tmp_path):
     """Test that multiple dictionary files are combined"""
-    print("\n" + "=" * 60)
-    print("TEST 4: Multiple dictionary files")
-    print("=" * 60)
-    
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir_path = Path(tmpdir)
-        
-        # Create multiple dictionary files
-        (tmpdir_path / 'frf.dca').write_bytes(b'Dict1')
-        (tmpdir_path / 'frf_accent_restoration.dca').write_bytes(b'Dict2')
-        
-        tts = BVCUTextToSpeech(tmpdir, 'fr')
-        
-        # Verify dictionaries were combined
-        assert tts.bvcu_data['dictionary'] is not None, "Should have dictionary"
-        assert len(tts.bvcu_data['dictionary']) == 10, "Should combine both dictionaries (10 bytes)"
-        
-        print("✓ TEST PASSED: Multiple dictionaries combined correctly")
-        return True
-
-
-def test_bvcu_file_extension():
+    print(f"\n{_RULE}\nTEST 4: Multiple dictionary files\n{_RULE}")
+    
+    # Create multiple dictionary files
+    (tmp_path / 'frf.dca').write_bytes(b'Dict1')
+    (tmp_path / 'frf_accent_restoration.dca').write_bytes(b'Dict2')
+    
+    tts = BVCUTextToSpeech(tmp_path, 'fr', lazy_engine=True)
+    
+    # Verify dictionaries were combined
+    assert tts.bvcu_data['dictionary'] is not None, "Should have dictionary"
+    assert len(tts.bvcu_data['dictionary']) == 10, "Should combine both dictionaries (10 bytes)"
+    assert tts.dictionary_size == 10, "dictionary_size should match the combined dictionary"
+    assert bytes(tts.bvcu_data['dictionary']) == b'Dict1Dict2', "Dictionaries should be combined in order"
+    assert [bytes(segment) for segment in tts.bvcu_data['dictionary'].segments()] == [b'Dict1', b'Dict2']
+    
+    # The combined dictionary can be copied into a caller-owned buffer
+    arena = bytearray(16)
+    assert tts.bvcu_data['dictionary'].readinto(arena) == 10, "Should copy 10 bytes"
+    assert arena[:10] == b'Dict1Dict2', "Buffer should hold both dictionaries"
+    
+    print("✓ TEST PASSED: Multiple dictionaries combined correctly")
+
+
+def test_case_insensitive_file_names(tmp_path, monkeypatch):
+    """Test that differently cased names are detected where the file system ignores case"""
+    print(f"\n{_RULE}\nTEST 4b: File names on case-insensitive file systems\n{_RULE}")
+    
+    # Compare names the way Windows and macOS do
+    monkeypatch.setattr(text_to_speech, '_name_key', str.lower)
+    monkeypatch.setattr(text_to_speech, '_REQUIRED_BY_KEY',
+                        {name.lower(): name for name in text_to_speech._REQUIRED_FILES})
+    (tmp_path / 'FRF.BNX').write_bytes(b'Upper case voice')
+    
+    tts = BVCUTextToSpeech(tmp_path, 'fr', lazy_engine=True)
+    
+    # Detected under its canonical name, read from the file as it is named
+    assert list(tts.voice_files) == ['frf.bnx'], "FRF.BNX should be detected as frf.bnx"
+    assert bytes(tts.bvcu_data['voice_data']) == b'Upper case voice', "Voice data mismatch"
+    
+    print("✓ TEST PASSED: Voice file names are matched as the file system compares them")
+
+
+def test_bvcu_file_extension(tmp_path):
     """Test that .bvcu files are detected and loaded"""
-    print("\n" + "=" * 60)
-    print("TEST 5: .bvcu file extension support")
-    print("=" * 60)
-    
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir_path = Path(tmpdir)
-        
-        # Create .bvcu files
-        (tmpdir_path / 'frf.bvcu').write_bytes(b'BVCU voice data in .bvcu format')
-        
-        tts = BVCUTextToSpeech(tmpdir, 'fr')
-        
-        # Verify .bvcu file was detected
-        assert 'frf.bvcu' in tts.voice_files, "Should detect frf.bvcu file"
-        assert len(tts.voice_files) == 1, f"Should find 1 voice file, found {len(tts.voice_files)}"
-        
-        # Verify .bvcu data was loaded
-        assert tts.bvcu_data['voice_data'] is not None, "Should have voice data"
-        assert len(tts.bvcu_data['voice_data']) == 31, "Voice data should be 31 bytes"
-        
-        print("✓ TEST PASSED: .bvcu files are properly detected and loaded")
-        return True
-
-
-def test_bvcu_hd_priority():
+    print(f"\n{_RULE}\nTEST 5: .bvcu file extension support\n{_RULE}")
+    
+    # Create .bvcu files
+    (tmp_path / 'frf.bvcu').write_bytes(b'BVCU voice data in .bvcu format')
+    
+    tts = BVCUTextToSpeech(tmp_path, 'fr', lazy_engine=True)
+    
+    # Verify .bvcu file was detected
+    assert 'frf.bvcu' in tts.voice_files, "Should detect frf.bvcu file"
+    assert len(tts.voice_files) == 1, "Should find 1 voice file"
+    
+    # Verify .bvcu data was loaded
+    assert tts.bvcu_data['voice_data'] is not None, "Should have voice data"
+    assert len(tts.bvcu_data['voice_data']) == 31, "Voice data should be 31 bytes"
+    
+    print("✓ TEST PASSED: .bvcu files are properly detected and loaded")
+
+
+def test_bvcu_hd_priority(tmp_path):
     """Test that HD .bvcu files take priority over standard .bvcu files"""
-    print("\n" + "=" * 60)
-    print("TEST 6: HD .bvcu file priority")
-    print("=" * 60)
-    
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir_path = Path(tmpdir)
-        
-        # Create both standard and HD .bvcu files
-        (tmpdir_path / 'frf.bvcu').write_bytes(b'Standard BVCU')
-        (tmpdir_path / 'frf_hd.bvcu').write_bytes(b'High definition BVCU voice data')
-        
-        tts = BVCUTextToSpeech(tmpdir, 'fr')
-        
-        # Verify HD .bvcu was used (it's larger)
-        assert tts.bvcu_data['voice_data'] is not None, "Should have voice data"
-        assert len(tts.bvcu_data['voice_data']) == 31, "Should use HD .bvcu data (31 bytes)"
-        
-        print("✓ TEST PASSED: HD .bvcu files take priority")
-        return True
-
-
-def test_bvcu_and_bnx_coexistence():
+    print(f"\n{_RULE}\nTEST 6: HD .bvcu file priority\n{_RULE}")
+    
+    # Create both standard and HD .bvcu files
+    (tmp_path / 'frf.bvcu').write_bytes(b'Standard BVCU')
+    (tmp_path / 'frf_hd.bvcu').write_bytes(b'High definition BVCU voice data')
+    
+    tts = BVCUTextToSpeech(tmp_path, 'fr', lazy_engine=True)
+    
+    # Verify HD .bvcu was used (it's larger)
+    assert tts.bvcu_data['voice_data'] is not None, "Should have voice data"
+    assert len(tts.bvcu_data['voice_data']) == 31, "Should use HD .bvcu data (31 bytes)"
+    
+    print("✓ TEST PASSED: HD .bvcu files take priority")
+
+
+def test_bvcu_and_bnx_coexistence(tmp_path):
     """Test that .bvcu and .bnx files can coexist, with larger file taking priority"""
-    print("\n" + "=" * 60)
-    print("TEST 7: .bvcu and .bnx coexistence")
-    print("=" * 60)
-    
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir_path = Path(tmpdir)
-        
-        # Create both .bvcu (smaller) and .bnx (larger) files
-        (tmpdir_path / 'frf.bvcu').write_bytes(b'Small BVCU')
-        (tmpdir_path / 'frf.bnx').write_bytes(b'Larger BNX voice data file')
-        
-        tts = BVCUTextToSpeech(tmpdir, 'fr')
-        
-        # Verify both were detected
-        assert 'frf.bvcu' in tts.voice_files, "Should detect frf.bvcu"
-        assert 'frf.bnx' in tts.voice_files, "Should detect frf.bnx"
-        
-        # Verify larger .bnx was used
-        assert tts.bvcu_data['voice_data'] is not None, "Should have voice data"
-        assert len(tts.bvcu_data['voice_data']) == 26, "Should use larger .bnx data (26 bytes)"
-        
-        print("✓ TEST PASSED: .bvcu and .bnx files coexist properly")
-        return True
-
-
-def main():
-    """Run all tests"""
-    print("=" * 60)
-    print("BVCU File Loading Test Suite")
-    print("=" * 60)
-    
-    tests = [
-        test_no_bvcu_files,
-        test_with_bvcu_files,
-        test_hd_voice_priority,
-        test_multiple_dictionaries,
-        test_bvcu_file_extension,
-        test_bvcu_hd_priority,
-        test_bvcu_and_bnx_coexistence,
-    ]
-    
-    passed = 0
-    failed = 0
-    
-    for test_func in tests:
-        try:
-            if test_func():
-                passed += 1
-            else:
-                failed += 1
-        except Exception as e:
-            print(f"✗ TEST FAILED: {test_func.__name__}")
-            print(f"  Error: {e}")
-            failed += 1
-    
-    print("\n" + "=" * 60)
-    print("TEST SUMMARY")
-    print("=" * 60)
-    print(f"Tests passed: {passed}")
-    print(f"Tests failed: {failed}")
-    print(f"Success rate: {passed / (passed + failed) * 100:.1f}%")
-    print("=" * 60)
-    
-    if failed == 0:
-        print("\n✓ ALL TESTS PASSED!")
-        return 0
-    else:
-        print(f"\n✗ {failed} TEST(S) FAILED")
-        return 1
+    print(f"\n{_RULE}\nTEST 7: .bvcu and .bnx coexistence\n{_RULE}")
+    
+    # Create both .bvcu (smaller) and .bnx (larger) files
+    (tmp_path / 'frf.bvcu').write_bytes(b'Small BVCU')
+    (tmp_path / 'frf.bnx').write_bytes(b'Larger BNX voice data file')
+    
+    tts = BVCUTextToSpeech(tmp_path, 'fr', lazy_engine=True)
+    
+    # Verify both were detected
+    assert 'frf.bvcu' in tts.voice_files, "Should detect frf.bvcu"
+    assert 'frf.bnx' in tts.voice_files, "Should detect frf.bnx"
+    
+    # Both sizes are recorded on voice_files during detection
+    assert len(tts.voice_files['frf.bvcu']) == 10, "frf.bvcu should be 10 bytes"
+    assert len(tts.voice_files['frf.bnx']) == 26, "frf.bnx should be 26 bytes"
+    
+    # voice_files values are still usable as paths
+    assert Path(tts.voice_files['frf.bvcu']) == tmp_path / 'frf.bvcu', "Should be path-like"
+    with open(tts.voice_files['frf.bnx'], 'rb') as f:
+        assert f.read() == b'Larger BNX voice data file', "Should open the detected file"
+    
+    # Verify larger .bnx was used
+    assert tts.bvcu_data['voice_data'] is not None, "Should have voice data"
+    assert len(tts.bvcu_data['voice_data']) == 26, "Should use larger .bnx data (26 bytes)"
+    assert tts.files_count == 2, "files_count should match the detected files"
+    assert tts.voice_data_size == 26, "voice_data_size should match the selected file"
+    
+    print("✓ TEST PASSED: .bvcu and .bnx files coexist properly")
+
+
+def test_prebuilt_voice_cache(tmp_path):
+    """Test that the prebuilt voice cache is used and invalidated when sources change"""
+    print(f"\n{_RULE}\nTEST 8: Prebuilt voice cache\n{_RULE}")
+    
+    (tmp_path / 'frf.bnx').write_bytes(b'Standard voice')
+    (tmp_path / 'frf_hd.bnx').write_bytes(b'High definition voice data')
+    (tmp_path / 'frf.dca').write_bytes(b'Dict1')
+    (tmp_path / 'frf_accent_restoration.dca').write_bytes(b'Dict2')
+    (tmp_path / 'frf.oso').write_bytes(b'BVCU orthographic')
+    
+    assert prebuild(tmp_path), "Prebuild should succeed"
+    
+    tts = BVCUTextToSpeech(tmp_path, 'fr', lazy_engine=True)
+    
+    # Blobs are served from the prebuilt file with the same contents
+    assert os.path.basename(tts.bvcu_data['voice_data'].path) == PREBUILT_DATA, "Should use prebuilt cache"
+    assert bytes(tts.bvcu_data['voice_data']) == b'High definition voice data', "Voice data mismatch"
+    assert bytes(tts.bvcu_data['dictionary']) == b'Dict1Dict2', "Dictionary mismatch"
+    assert [bytes(segment) for segment in tts.bvcu_data['dictionary'].segments()] == [b'Dict1', b'Dict2']
+    assert bytes(tts.bvcu_data['configuration']['frf.oso']) == b'BVCU orthographic', "Config mismatch"
+    
+    # The index is plain JSON, never unpickled
+    index = json.loads((tmp_path / PREBUILT_INDEX).read_text(encoding='utf-8'))
+    assert index['blobs']['dictionary'] == [[26, 5], [31, 5]], "Dictionary parts should be kept"
+    
+    # Changing a source file invalidates the cache
+    (tmp_path / 'frf.bnx').write_bytes(b'Much larger standard voice data file')
+    tts = BVCUTextToSpeech(tmp_path, 'fr', lazy_engine=True)
+    assert os.path.basename(tts.bvcu_data['voice_data'].path) == 'frf.bnx', "Stale cache should be ignored"
+    assert len(tts.bvcu_data['voice_data']) == 36, "Should use the new frf.bnx data (36 bytes)"
+    
+    print("✓ TEST PASSED: Prebuilt voice cache is used while up to date")
+
+
+def test_close_unmaps_voice_files(tmp_path):
+    """Test that close() unmaps the voice files and that they can be mapped again"""
+    print(f"\n{_RULE}\nTEST 9: Unmapping voice files\n{_RULE}")
+    
+    (tmp_path / 'frf.bnx').write_bytes(b'BVCU voice data sample')
+    (tmp_path / 'frf.dca').write_bytes(b'Dict1')
+    
+    tts = BVCUTextToSpeech(tmp_path, 'fr', lazy_engine=True)
+    assert bytes(tts.bvcu_data['voice_data']) == b'BVCU voice data sample', "Voice data mismatch"
+    assert bytes(tts.bvcu_data['dictionary']) == b'Dict1', "Dictionary mismatch"
+    assert tts.bvcu_data['voice_data'].sequential, "Voice data should be read sequentially"
+    
+    tts.close()
+    assert not tts.voice_files['frf.bnx'].loaded, "Voice data should be unmapped"
+    assert not tts.voice_files['frf.dca'].loaded, "Dictionary should be unmapped"
+    
+    # Closed blobs are mapped again on the next access
+    assert bytes(tts.bvcu_data['voice_data']) == b'BVCU voice data sample', "Voice data mismatch"
+    
+    print("✓ TEST PASSED: Voice files are unmapped and remapped on demand")
+
+
+def test_voice_file_digest_cache(tmp_path):
+    """Test that voice file digests are cached and recomputed when the file changes"""
+    print(f"\n{_RULE}\nTEST 10: Voice file digest cache\n{_RULE}")
+    
+    (tmp_path / 'frf.bnx').write_bytes(b'Standard voice')
+    tts = BVCUTextToSpeech(tmp_path, 'fr', lazy_engine=True)
+    
+    assert tts._verify('frf.bnx') == hashlib.sha256(b'Standard voice').digest(), "Digest mismatch"
+    cache = json.loads((tmp_path / DIGEST_CACHE).read_text(encoding='utf-8'))
+    assert cache['frf.bnx'][2] == hashlib.sha256(b'Standard voice').hexdigest(), "Digest not cached"
+    
+    # An up-to-date cache entry is returned without hashing the file
+    cache['frf.bnx'][2] = '00' * 32
+    (tmp_path / DIGEST_CACHE).write_text(json.dumps(cache), encoding='utf-8')
+    assert tts._verify('frf.bnx') == bytes(32), "Cached digest should be used"
+    
+    # A malformed cache or entry is ignored and replaced
+    st = os.stat(tmp_path / 'frf.bnx')
+    for bad_cache in ([], "x", {'frf.bnx': 5}, {'frf.bnx': [st.st_mtime_ns, st.st_size]},
+                      {'frf.bnx': [st.st_mtime_ns, st.st_size, 'not hex']}):
+        (tmp_path / DIGEST_CACHE).write_text(json.dumps(bad_cache), encoding='utf-8')
+        assert tts._verify('frf.bnx') == hashlib.sha256(b'Standard voice').digest(), bad_cache
+    
+    # Rewriting the file invalidates its entry
+    (tmp_path / 'frf.bnx').write_bytes(b'Much larger standard voice')
+    assert tts._verify('frf.bnx') == hashlib.sha256(b'Much larger standard voice').digest()
+    
+    print("✓ TEST PASSED: Voice file digests are cached per file version")
+
+
+def test_voice_file_digest_cache_keeps_concurrent_entries(tmp_path, monkeypatch):
+    """Test that entries written by another verifier while hashing are kept"""
+    print(f"\n{_RULE}\nTEST 11: Concurrent digest cache updates\n{_RULE}")
+    
+    (tmp_path / 'frf.bnx').write_bytes(b'Standard voice')
+    tts = BVCUTextToSpeech(tmp_path, 'fr', lazy_engine=True)
+    other_entry = [1, 2, '11' * 32]
+    
+    # Another process stores its digest while this one is hashing frf.bnx
+    fadvise = text_to_speech._fadvise
+    def fadvise_then_store(fd, offset, length, *advice):
+        if 'POSIX_FADV_DONTNEED' in advice:
+            (tmp_path / DIGEST_CACHE).write_text(json.dumps({'frf.dca': other_entry}), encoding='utf-8')
+        fadvise(fd, offset, length, *advice)
+    monkeypatch.setattr(text_to_speech, '_fadvise', fadvise_then_store)
+    
+    assert tts._verify('frf.bnx') == hashlib.sha256(b'Standard voice').digest(), "Digest mismatch"
+    cache = json.loads((tmp_path / DIGEST_CACHE).read_text(encoding='utf-8'))
+    assert cache['frf.dca'] == other_entry, "The other verifier's entry was lost"
+    assert 'frf.bnx' in cache, "Digest not cached"
+    assert not list(tmp_path.glob('*.tmp')), "Temporary cache file left behind"
+    
+    print("✓ TEST PASSED: Concurrent digest cache entries are merged")
 
 
 if __name__ == '__main__':
-    sys.exit(main())
+    sys.exit(pytest.main([__file__]))
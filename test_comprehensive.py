@@ -2,188 +2,154 @@
 """
 Comprehensive test script that validates BVCU files are properly loaded and used.
 This script runs many iterations to ensure stability and correctness.
+
+Run with pytest; the shared `tts_fr` instance comes from conftest.py.
 """
 
 import os
 import sys
+import time
 from pathlib import Path
+
+import pytest
+
 from text_to_speech import BVCUTextToSpeech
+from tts_cache import _clone_tts, _get_tts
+
+_RULE = "=" * 60
 
 
 def test_bvcu_files_exist():
     """Test that .bvcu files exist in the voices directory"""
-    print("\n" + "=" * 60)
-    print("TEST: Verify .bvcu files exist in voices directory")
-    print("=" * 60)
-    
+    print(f"\n{_RULE}\nTEST: Verify .bvcu files exist in voices directory\n{_RULE}")
+
     voices_path = Path("voices")
     # Check for claire_22k_lf.bvcu which is the main voice file
     required_bvcu_files = ['claire_22k_lf.bvcu']
-    
+
     for filename in required_bvcu_files:
         file_path = voices_path / filename
-        if not file_path.exists():
-            print(f"✗ MISSING: {filename}")
-            return False
-        else:
-            size = file_path.stat().st_size
-            print(f"✓ Found: {filename} ({size} bytes)")
-    
+        assert file_path.exists()
+        size = file_path.stat().st_size
+        print(f"✓ Found: {filename} ({size} bytes)")
+
     print("✓ TEST PASSED: All required .bvcu files exist")
-    return True
 
 
-def test_bvcu_files_detected():
+def test_bvcu_files_detected(tts_fr):
     """Test that BVCUTextToSpeech class detects .bvcu files"""
-    print("\n" + "=" * 60)
-    print("TEST: Verify .bvcu files are detected by the program")
-    print("=" * 60)
-    
-    tts = BVCUTextToSpeech("voices", 'fr')
-    
+    print(f"\n{_RULE}\nTEST: Verify .bvcu files are detected by the program\n{_RULE}")
+
     # Check that claire_22k_lf.bvcu was detected
-    if 'claire_22k_lf.bvcu' not in tts.voice_files:
-        print("✗ claire_22k_lf.bvcu not detected")
-        return False
-    
-    print(f"✓ Detected {len(tts.voice_files)} voice files including claire_22k_lf.bvcu")
+    assert 'claire_22k_lf.bvcu' in tts_fr.voice_files, "claire_22k_lf.bvcu not detected"
+
+    print(f"✓ Detected {len(tts_fr.voice_files)} voice files including claire_22k_lf.bvcu")
     print("✓ TEST PASSED: .bvcu files are properly detected")
-    return True
 
 
-def test_bvcu_files_loaded():
+def test_bvcu_files_loaded(tts_fr):
     """Test that .bvcu files are loaded and data is accessible"""
-    print("\n" + "=" * 60)
-    print("TEST: Verify .bvcu files are loaded into memory")
-    print("=" * 60)
-    
-    tts = BVCUTextToSpeech("voices", 'fr')
-    
+    print(f"\n{_RULE}\nTEST: Verify .bvcu files are loaded into memory\n{_RULE}")
+
     # Verify voice data was loaded
-    if tts.bvcu_data['voice_data'] is None:
-        print("✗ Voice data not loaded")
-        return False
-    
-    if len(tts.bvcu_data['voice_data']) == 0:
-        print("✗ Voice data is empty")
-        return False
-    
-    print(f"✓ Voice data loaded: {len(tts.bvcu_data['voice_data'])} bytes")
-    
+    assert tts_fr.bvcu_data['voice_data'] is not None, "Voice data not loaded"
+    assert len(tts_fr.bvcu_data['voice_data']) > 0, "Voice data is empty"
+
+    print(f"✓ Voice data loaded: {len(tts_fr.bvcu_data['voice_data'])} bytes")
+
     # Verify dictionary was loaded
-    if tts.bvcu_data['dictionary'] is not None:
-        print(f"✓ Dictionary loaded: {len(tts.bvcu_data['dictionary'])} bytes")
-    
+    if tts_fr.bvcu_data['dictionary'] is not None:
+        print(f"✓ Dictionary loaded: {len(tts_fr.bvcu_data['dictionary'])} bytes")
+
     # Verify linguistic data was loaded
-    if tts.bvcu_data['linguistic'] is not None:
-        print(f"✓ Linguistic data loaded: {len(tts.bvcu_data['linguistic'])} bytes")
-    
+    if tts_fr.bvcu_data['linguistic'] is not None:
+        print(f"✓ Linguistic data loaded: {len(tts_fr.bvcu_data['linguistic'])} bytes")
+
     print("✓ TEST PASSED: BVCU files are properly loaded")
-    return True
-
-
-def test_multiple_initializations(iterations=50):
-    """Test that the program can be initialized multiple times without errors"""
-    print("\n" + "=" * 60)
-    print(f"TEST: Initialize program {iterations} times")
-    print("=" * 60)
-    
-    for i in range(iterations):
-        try:
-            tts = BVCUTextToSpeech("voices", 'fr')
-            
-            # Verify claire_22k_lf.bvcu is detected each time
-            if 'claire_22k_lf.bvcu' not in tts.voice_files:
-                print(f"✗ Iteration {i+1}: claire_22k_lf.bvcu not detected")
-                return False
-            
-            # Verify data is loaded each time
-            if tts.bvcu_data['voice_data'] is None or len(tts.bvcu_data['voice_data']) == 0:
-                print(f"✗ Iteration {i+1}: Voice data not loaded")
-                return False
-            
-            if (i + 1) % 10 == 0:
-                print(f"✓ Completed {i+1}/{iterations} iterations successfully")
-        
-        except Exception as e:
-            print(f"✗ Iteration {i+1} failed: {e}")
-            return False
-    
+
+
+def test_fresh_initialization():
+    """Test that a freshly constructed instance (no cache) loads voice files"""
+    print(f"\n{_RULE}\nTEST: Fresh initialization without the instance cache\n{_RULE}")
+
+    tts = BVCUTextToSpeech("voices", 'fr', lazy_engine=True)
+
+    assert 'claire_22k_lf.bvcu' in tts.voice_files, "claire_22k_lf.bvcu not detected"
+    assert tts.bvcu_data['voice_data'] is not None, "Voice data not loaded"
+    assert len(tts.bvcu_data['voice_data']) > 0, "Voice data is empty"
+
+    print("✓ TEST PASSED: Fresh initialization loads voice files")
+
+
+def _check_initialization(tts):
+    """Verify claire_22k_lf.bvcu is detected and voice data is loaded"""
+    assert 'claire_22k_lf.bvcu' in tts.voice_files, "claire_22k_lf.bvcu not detected"
+    assert tts.bvcu_data['voice_data'] is not None, "Voice data not loaded"
+    assert len(tts.bvcu_data['voice_data']) > 0, "Voice data is empty"
+
+
+@pytest.mark.slow
+def test_multiple_initializations(record_property, time_budget=2.0):
+    """Test that the program can be initialized multiple times without errors
+
+    Instances come from the memoized factory, so only the first iteration
+    scans the voices directory; the engine is never initialized. The number
+    of iterations is sized from one timed iteration so the loop takes about
+    time_budget seconds (between 10 and 500 iterations).
+    """
+    # Warm up the factory cache, then time a single iteration
+    _get_tts("voices", 'fr', lazy_engine=True)
+    start = time.perf_counter()
+    _check_initialization(_get_tts("voices", 'fr', lazy_engine=True))
+    per_iteration = max(time.perf_counter() - start, 1e-9)
+    iterations = max(10, min(500, int(time_budget / per_iteration)))
+
+    print(f"\n{_RULE}\nTEST: Initialize program {iterations} times\n{_RULE}")
+
+    for _ in range(iterations):
+        _check_initialization(_get_tts("voices", 'fr', lazy_engine=True))
+
+    record_property("iterations_run", iterations)
     print(f"✓ TEST PASSED: All {iterations} iterations successful")
-    return True
 
 
-def test_file_priority():
+def test_file_priority(tts_fr):
     """Test that larger .bvcu files take priority"""
-    print("\n" + "=" * 60)
-    print("TEST: Verify .bvcu file priority")
-    print("=" * 60)
-    
-    tts = BVCUTextToSpeech("voices", 'fr')
-    
+    print(f"\n{_RULE}\nTEST: Verify .bvcu file priority\n{_RULE}")
+
     # claire_22k_lf.bvcu is the largest file and should be used
-    voice_data_size = len(tts.bvcu_data['voice_data'])
-    
-    # Get the size of claire_22k_lf.bvcu
-    claire_bvcu_size = Path("voices/claire_22k_lf.bvcu").stat().st_size
-    
+    voice_data_size = len(tts_fr.bvcu_data['voice_data'])
+
+    # Size of claire_22k_lf.bvcu as recorded during the directory scan
+    claire_bvcu_size = len(tts_fr.voice_files['claire_22k_lf.bvcu'])
+
     # The largest file (claire_22k_lf.bvcu) should be used
-    if voice_data_size != claire_bvcu_size:
-        print(f"✗ Unexpected voice data size: {voice_data_size} (expected {claire_bvcu_size})")
-        return False
-    
+    assert voice_data_size == claire_bvcu_size
+
     print(f"✓ Voice data size: {voice_data_size:,} bytes (from claire_22k_lf.bvcu)")
     print("✓ TEST PASSED: Correct file priority handling")
-    return True
-
-
-def main():
-    """Run all comprehensive tests"""
-    print("=" * 60)
-    print("BVCU Comprehensive Test Suite")
-    print("Testing .bvcu file support and stability")
-    print("=" * 60)
-    
-    tests = [
-        ("BVCU files exist", test_bvcu_files_exist),
-        ("BVCU files detected", test_bvcu_files_detected),
-        ("BVCU files loaded", test_bvcu_files_loaded),
-        ("File priority", test_file_priority),
-        ("Multiple initializations (50x)", lambda: test_multiple_initializations(50)),
-    ]
-    
-    passed = 0
-    failed = 0
-    
-    for test_name, test_func in tests:
-        try:
-            if test_func():
-                passed += 1
-            else:
-                failed += 1
-                print(f"\n✗ FAILED: {test_name}")
-        except Exception as e:
-            print(f"\n✗ FAILED: {test_name}")
-            print(f"  Error: {e}")
-            failed += 1
-    
-    print("\n" + "=" * 60)
-    print("COMPREHENSIVE TEST SUMMARY")
-    print("=" * 60)
-    print(f"Tests passed: {passed}")
-    print(f"Tests failed: {failed}")
-    print(f"Success rate: {passed / (passed + failed) * 100:.1f}%")
-    print("=" * 60)
-    
-    if failed == 0:
-        print("\n✓ ALL COMPREHENSIVE TESTS PASSED!")
-        print("✓ The program has been tested extensively and is stable.")
-        print("✓ .bvcu files are properly integrated and working correctly.")
-        return 0
-    else:
-        print(f"\n✗ {failed} TEST(S) FAILED")
-        return 1
+
+
+def test_voice_bundle_follows_directory_changes(tmp_path):
+    """Test that cloned instances share voice files until the directory changes"""
+    print(f"\n{_RULE}\nTEST: Voice bundle cache invalidation\n{_RULE}")
+
+    (tmp_path / 'frf.bnx').write_bytes(b'Standard voice')
+    first = _clone_tts(tmp_path, 'fr', lazy_engine=True)
+    second = _clone_tts(tmp_path, 'fr', lazy_engine=True)
+    assert first is not second
+    assert first.bvcu_data['voice_data'] is second.bvcu_data['voice_data']
+
+    # A new file changes the directory's mtime and triggers a new scan; the
+    # mtime is also set explicitly for filesystems with coarse timestamps
+    (tmp_path / 'frf_hd.bnx').write_bytes(b'High definition voice data')
+    os.utime(tmp_path, ns=(0, 0))
+    third = _clone_tts(tmp_path, 'fr', lazy_engine=True)
+    assert 'frf_hd.bnx' in third.voice_files
+    assert len(third.bvcu_data['voice_data']) == 26
+
+    print("✓ TEST PASSED: Voice bundle is reloaded when the directory changes")
 
 
 if __name__ == '__main__':
-    sys.exit(main())
+    sys.exit(pytest.main([__file__]))
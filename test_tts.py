@@ -2,186 +2,233 @@
 """
 Test script for BVCU Text-to-Speech Converter
 
-This script tests all major functionality of the TTS program.
+This script tests all major functionality of the TTS program. The command
+line is exercised in-process through text_to_speech.main(); only the argparse
+error path is checked in a separate interpreter.
 """
 
+import contextlib
+import io
 import os
-import sys
 import subprocess
-import tempfile
-from pathlib import Path
+import sys
+import time
 
+import pytest
 
-def run_command(cmd, description):
-    """Run a command and report results"""
-    print(f"\n{'='*60}")
-    print(f"TEST: {description}")
-    print(f"{'='*60}")
-    print(f"Command: {' '.join(cmd)}")
-    print()
-    
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        print(result.stdout)
-        if result.stderr:
-            print("STDERR:", result.stderr)
-        
-        if result.returncode == 0:
-            print(f"✓ TEST PASSED: {description}")
-            return True
-        else:
-            print(f"✗ TEST FAILED: {description} (exit code: {result.returncode})")
-            return False
-            
-    except subprocess.TimeoutExpired:
-        print(f"✗ TEST FAILED: {description} (timeout)")
-        return False
-    except Exception as e:
-        print(f"✗ TEST FAILED: {description} (error: {e})")
-        return False
-
-
-def main():
-    """Run all tests"""
-    print("BVCU Text-to-Speech Converter - Test Suite")
-    print("=" * 60)
-    
-    tests_passed = 0
-    tests_failed = 0
-    
-    # Test 1: Help message
-    if run_command(
-        ["python3", "text_to_speech.py", "-h"],
-        "Display help message"
-    ):
-        tests_passed += 1
-    else:
-        tests_failed += 1
-    
-    # Test 2: Simple French text to audio file
-    output_file = "test_french.wav"
-    if run_command(
-        ["python3", "text_to_speech.py", 
-         "-t", "Bonjour, ceci est un test de synthèse vocale",
-         "-o", output_file],
-        "French text to WAV file"
-    ):
-        if os.path.exists(output_file):
-            size = os.path.getsize(output_file)
-            print(f"✓ Output file created: {output_file} ({size} bytes)")
-            os.remove(output_file)
-            tests_passed += 1
-        else:
-            print(f"✗ Output file not created: {output_file}")
-            tests_failed += 1
-    else:
-        tests_failed += 1
-    
-    # Test 3: Read from file
-    test_file = tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8')
-    test_file.write("Ceci est un texte de test.\nIl contient plusieurs lignes.\nMerci!")
-    test_file.close()
-    
-    output_file = "test_from_file.wav"
-    if run_command(
-        ["python3", "text_to_speech.py",
-         "-f", test_file.name,
-         "-o", output_file],
-        "Read text from file"
-    ):
-        if os.path.exists(output_file):
-            print(f"✓ Output file created from input file")
-            os.remove(output_file)
-            tests_passed += 1
-        else:
-            print(f"✗ Output file not created")
-            tests_failed += 1
-    else:
-        tests_failed += 1
-    
-    os.remove(test_file.name)
-    
-    # Test 4: English text
-    output_file = "test_english.wav"
-    if run_command(
-        ["python3", "text_to_speech.py",
-         "-t", "This is an English test",
-         "-l", "en",
-         "-o", output_file],
-        "English text synthesis"
-    ):
-        if os.path.exists(output_file):
-            print(f"✓ English audio file created")
-            os.remove(output_file)
-            tests_passed += 1
-        else:
-            print(f"✗ Output file not created")
-            tests_failed += 1
-    else:
-        tests_failed += 1
+import text_to_speech
+from text_to_speech import BVCUTextToSpeech, _TTSRequestPool, _split_sentences, main
+
+
+# Skips the test when the shared engine cannot start (see conftest.engine)
+requires_engine = pytest.mark.usefixtures("engine")
+
+
+def run_main(argv):
+    """Run the converter in-process and return (exit code, captured stdout)"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        exit_code = main(argv)
+    return exit_code, output.getvalue()
+
+
+def test_help_message():
+    """Display help message"""
+    with pytest.raises(SystemExit) as exc_info:
+        run_main(["-h"])
+    assert exc_info.value.code == 0
+
+
+@requires_engine
+def test_french_text_to_wav(tmp_path):
+    """French text to WAV file"""
+    output_file = tmp_path / "french.wav"
+    exit_code, output = run_main(
+        ["-t", "Bonjour, ceci est un test de synthèse vocale", "-o", str(output_file)]
+    )
+    assert exit_code == 0, output
+    assert output_file.exists(), f"Output file not created: {output_file}"
+    print(f"✓ Output file created: {output_file} ({output_file.stat().st_size} bytes)")
+
+
+@requires_engine
+def test_read_from_file(tmp_path):
+    """Read text from file"""
+    test_file = tmp_path / "input.txt"
+    test_file.write_text("Ceci est un texte de test.\nIl contient plusieurs lignes.\nMerci!", encoding='utf-8')
     
-    # Test 5: Test with example.txt
-    if os.path.exists("example.txt"):
-        output_file = "test_example.wav"
-        if run_command(
-            ["python3", "text_to_speech.py",
-             "-f", "example.txt",
-             "-o", output_file],
-            "Synthesize example.txt"
-        ):
-            if os.path.exists(output_file):
-                size = os.path.getsize(output_file)
-                print(f"✓ Example file synthesized: {size} bytes")
-                os.remove(output_file)
-                tests_passed += 1
-            else:
-                print(f"✗ Output file not created")
-                tests_failed += 1
-        else:
-            tests_failed += 1
-    else:
-        print("\n✗ example.txt not found, skipping test")
-        tests_failed += 1
+    output_file = tmp_path / "from_file.wav"
+    exit_code, output = run_main(["-f", str(test_file), "-o", str(output_file)])
+    assert exit_code == 0, output
+    assert output_file.exists(), "Output file not created"
+
+
+@requires_engine
+def test_english_text(tmp_path):
+    """English text synthesis"""
+    output_file = tmp_path / "english.wav"
+    exit_code, output = run_main(["-t", "This is an English test", "-l", "en", "-o", str(output_file)])
+    assert exit_code == 0, output
+    assert output_file.exists(), "Output file not created"
+
+
+@requires_engine
+def test_example_file(tmp_path):
+    """Synthesize example.txt"""
+    assert os.path.exists("example.txt"), "example.txt not found"
     
-    # Test 6: Error handling - no input
-    print(f"\n{'='*60}")
-    print(f"TEST: Error handling - no input provided")
-    print(f"{'='*60}")
+    output_file = tmp_path / "example.wav"
+    exit_code, output = run_main(["-f", "example.txt", "-o", str(output_file)])
+    assert exit_code == 0, output
+    assert output_file.exists(), "Output file not created"
+    print(f"✓ Example file synthesized: {output_file.stat().st_size} bytes")
+
+
+class _RecordingEngine:
+    """Stand-in engine recording the calls made by the request pool"""
+
+    def __init__(self):
+        self.calls = []
+
+    def setProperty(self, name, value):
+        self.calls.append(('setProperty', name, value))
+
+    def say(self, text):
+        self.calls.append(('say', text))
+
+    def save_to_file(self, text, output_file):
+        self.calls.append(('save_to_file', text))
+        with open(output_file, 'wb') as f:
+            f.write(b'RIFF')
+
+    def runAndWait(self):
+        self.calls.append(('runAndWait',))
+
+
+def test_request_pool_batches_requests(tmp_path):
+    """Request pool - queued texts are synthesized by one worker, in order"""
+    engine = _RecordingEngine()
+    pool = _TTSRequestPool(engine)
+    try:
+        futures = [
+            pool.submit("Bonjour", voice_id='roa/fr'),
+            pool.submit("Hello", str(tmp_path / "hello.wav"), voice_id='gmw/en'),
+        ]
+        assert [future.result(timeout=10) for future in futures] == [True, True]
+    finally:
+        pool.close()
+
+    texts = [call[1] for call in engine.calls if call[0] in ('say', 'save_to_file')]
+    assert texts == ["Bonjour", "Hello"]
+    assert ('setProperty', 'voice', 'gmw/en') in engine.calls
+    assert engine.calls[-1] == ('runAndWait',)
+    assert (tmp_path / "hello.wav").exists()
+
+
+class _SlowEngine(_RecordingEngine):
+    """Recording engine whose runAndWait() takes a while and notes overlaps"""
+
+    def __init__(self):
+        super().__init__()
+        self.running = 0
+        self.overlaps = 0
+
+    def runAndWait(self):
+        self.running += 1
+        if self.running > 1:
+            self.overlaps += 1
+        time.sleep(0.005)
+        super().runAndWait()
+        self.running -= 1
+
+
+def test_submit_and_synthesize_share_the_engine(tmp_path):
+    """Request pool - queued texts and synthesize() never run the engine at once"""
+    tts = BVCUTextToSpeech(tmp_path, 'fr', lazy_engine=True)
+    tts._engine = engine = _SlowEngine()
+    tts._engine_initialized = True
+
+    futures = []
+    for n in range(10):
+        futures += [tts.submit(f"Phrase {n}.{k}") for k in range(3)]
+        assert tts.synthesize(f"Bonjour {n}.")
+    assert all(future.result(timeout=10) for future in futures)
+
+    assert engine.overlaps == 0, "runAndWait() was entered from two threads at once"
+    spoken = [call[1] for call in engine.calls if call[0] == 'say']
+    assert len(spoken) == 40
+
+
+def test_playback_is_queued_per_sentence(tmp_path):
+    """Playback - each sentence is its own utterance, run with one runAndWait"""
+    assert _split_sentences("  Bonjour.  Ça va ?\nTrès bien!  ") == ["Bonjour.", "Ça va ?", "Très bien!"]
+
+    tts = BVCUTextToSpeech(tmp_path, 'fr', lazy_engine=True)
+    tts._engine = engine = _RecordingEngine()
+    tts._engine_initialized = True
+    assert tts.synthesize("Première phrase. Deuxième phrase!")
+
+    assert engine.calls == [
+        ('say', "Première phrase."), ('say', "Deuxième phrase!"), ('runAndWait',)
+    ]
+
+
+class _DefaultVoiceEngine(_RecordingEngine):
+    """Recording engine with the properties get_engine() configures"""
+
+    def getProperty(self, name):
+        return {'rate': 200, 'voice': 'default/voice'}[name]
+
+
+def test_unmatched_language_uses_the_default_voice(tmp_path, monkeypatch):
+    """Shared engine - an instance without a voice gets the engine's initial one"""
+    engine = _DefaultVoiceEngine()
+    monkeypatch.setattr(text_to_speech.pyttsx3, 'init', lambda driver_name=None: engine)
+    monkeypatch.setattr(text_to_speech, '_ENGINE_CACHE', {})
+    monkeypatch.setattr(text_to_speech, '_DEFAULT_VOICES', {})
+    assert text_to_speech.get_engine('test-driver') is engine
+
+    english = BVCUTextToSpeech(tmp_path, 'en', lazy_engine=True)
+    unmatched = BVCUTextToSpeech(tmp_path, 'xx', lazy_engine=True)
+    for tts, voice_id in ((english, 'gmw/en'), (unmatched, None)):
+        tts._engine, tts._engine_initialized, tts.voice_id = engine, True, voice_id
+
+    assert english.synthesize("Hello.")
+    assert unmatched.synthesize("Bonjour.")
+    assert unmatched.submit("Salut.").result(timeout=10)
+
+    voices = [call[2] for call in engine.calls if call[:2] == ('setProperty', 'voice')]
+    assert voices == ['gmw/en', 'default/voice', 'default/voice']
+
+
+def test_synthesize_to_bytes(tmp_path, monkeypatch):
+    """In-memory synthesis - the audio file contents are returned, no file is left"""
+    audio_tmpdir = tmp_path / "audio"
+    audio_tmpdir.mkdir()
+    monkeypatch.setattr(text_to_speech, '_RAM_TMPDIR', str(audio_tmpdir))
+    tts = BVCUTextToSpeech(tmp_path, 'fr', lazy_engine=True)
+    tts._engine = _RecordingEngine()
+    tts._engine_initialized = True
+
+    assert tts.synthesize_to_bytes("Bonjour") == bytearray(b'RIFF')
+    assert tts.synthesize_to_bytes("   ") is None
+    assert not list(audio_tmpdir.iterdir()), "Temporary audio file left behind"
+
+
+def test_no_input_rejected():
+    """Error handling - no input provided (run as a real command line)"""
+    # Only the exit code and the argparse error matter: discard stdout and keep
+    # stderr as raw bytes, decoding it only for the failure message
     result = subprocess.run(
-        ["python3", "text_to_speech.py"],
-        capture_output=True,
-        text=True
+        [sys.executable, "text_to_speech.py"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        timeout=30
     )
-    if result.returncode != 0:
-        print("✓ Correctly rejected invalid input (no text or file)")
-        tests_passed += 1
-    else:
-        print("✗ Should have failed with no input")
-        tests_failed += 1
-    
-    # Print summary
-    print(f"\n{'='*60}")
-    print("TEST SUMMARY")
-    print(f"{'='*60}")
-    print(f"Tests passed: {tests_passed}")
-    print(f"Tests failed: {tests_failed}")
-    print(f"Total tests: {tests_passed + tests_failed}")
-    print(f"Success rate: {tests_passed / (tests_passed + tests_failed) * 100:.1f}%")
-    print(f"{'='*60}")
-    
-    if tests_failed == 0:
-        print("\n✓ ALL TESTS PASSED!")
-        return 0
-    else:
-        print(f"\n✗ {tests_failed} TEST(S) FAILED")
-        return 1
+    assert result.returncode != 0, "Should have failed with no input"
+    assert b"Either --text or --file must be specified" in result.stderr, \
+        result.stderr.decode('utf-8', errors='replace')
 
 
 if __name__ == '__main__':
-    sys.exit(main())
+    sys.exit(pytest.main([__file__]))
@@ -9,166 +9,259 @@ The issue was that when requesting 'fr' (French), the system was selecting
 'roa/fr-be' (Belgian French) instead of 'roa/fr' (France French).
 """
 
-import tempfile
-from text_to_speech import BVCUTextToSpeech
+import sys
+from types import SimpleNamespace
 
+import pytest
 
-def test_french_voice_selection():
+import text_to_speech
+from text_to_speech import BVCUTextToSpeech, _all_voices, _build_voice_index
+
+_RULE = "=" * 70
+
+
+def test_french_voice_selection(tmp_path, engine):
     """Test that language='fr' selects French (France) not French (Belgium)"""
-    print("=" * 70)
-    print("TEST: Verify 'fr' selects French (France), not French (Belgium)")
-    print("=" * 70)
-    
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tts = BVCUTextToSpeech(tmpdir, language='fr')
-        
-        if tts.engine:
-            voices = tts.engine.getProperty('voices')
-            
-            # Find which French voice was selected
-            # We check by looking at what voice would match our criteria
-            exact_match = None
-            for voice in voices:
-                if voice.id.lower().endswith('/fr'):
-                    exact_match = voice
-                    break
-            
-            if exact_match:
-                print(f"✓ Expected: French (France) - {exact_match.id}")
-                print(f"✓ Test PASSED: Correct French voice is selected")
-                return True
-            else:
-                print("✗ Test FAILED: French (France) voice not found")
-                return False
-    
-    return False
-
-
-def test_english_voice_selection():
+    print(f"{_RULE}\nTEST: Verify 'fr' selects French (France), not French (Belgium)\n{_RULE}")
+
+    tts = BVCUTextToSpeech(tmp_path, language='fr')
+    voices = _all_voices()
+
+    # Find which French voice was selected
+    # We check by looking at what voice would match our criteria
+    exact_match = None
+    for voice in voices:
+        if voice.id.lower().endswith('/fr'):
+            exact_match = voice
+            break
+
+    assert exact_match, "French (France) voice not found"
+    assert tts.voice_id == exact_match.id, f"Selected {tts.voice_id} instead of {exact_match.id}"
+    print(f"✓ Expected: French (France) - {exact_match.id}")
+
+
+def test_english_voice_selection(tmp_path, engine):
     """Test that language='en' selects standard English"""
-    print("\n" + "=" * 70)
-    print("TEST: Verify 'en' selects English (Great Britain)")
-    print("=" * 70)
-    
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tts = BVCUTextToSpeech(tmpdir, language='en')
-        
-        if tts.engine:
-            voices = tts.engine.getProperty('voices')
-            
-            # Find which English voice was selected
-            exact_match = None
-            for voice in voices:
-                if voice.id.lower().endswith('/en'):
-                    exact_match = voice
-                    break
-            
-            if exact_match:
-                print(f"✓ Expected: {exact_match.name} - {exact_match.id}")
-                print(f"✓ Test PASSED: Correct English voice is selected")
-                return True
-            else:
-                print("✗ Test FAILED: English voice not found")
-                return False
-    
-    return False
-
-
-def test_spanish_voice_selection():
+    print(f"\n{_RULE}\nTEST: Verify 'en' selects English (Great Britain)\n{_RULE}")
+
+    tts = BVCUTextToSpeech(tmp_path, language='en')
+    voices = _all_voices()
+
+    # Find which English voice was selected
+    exact_match = None
+    for voice in voices:
+        if voice.id.lower().endswith('/en'):
+            exact_match = voice
+            break
+
+    assert exact_match, "English voice not found"
+    assert tts.voice_id == exact_match.id, f"Selected {tts.voice_id} instead of {exact_match.id}"
+    print(f"✓ Expected: {exact_match.name} - {exact_match.id}")
+
+
+def test_spanish_voice_selection(tmp_path, engine):
     """Test that language='es' selects Spanish (Spain)"""
-    print("\n" + "=" * 70)
-    print("TEST: Verify 'es' selects Spanish (Spain)")
-    print("=" * 70)
-    
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tts = BVCUTextToSpeech(tmpdir, language='es')
-        
-        if tts.engine:
-            voices = tts.engine.getProperty('voices')
-            
-            # Find which Spanish voice was selected
-            exact_match = None
-            for voice in voices:
-                if voice.id.lower().endswith('/es'):
-                    exact_match = voice
-                    break
-            
-            if exact_match:
-                print(f"✓ Expected: {exact_match.name} - {exact_match.id}")
-                print(f"✓ Test PASSED: Correct Spanish voice is selected")
-                return True
-            else:
-                print("✗ Test FAILED: Spanish voice not found")
-                return False
-    
-    return False
-
-
-def test_regional_variant_as_fallback():
+    print(f"\n{_RULE}\nTEST: Verify 'es' selects Spanish (Spain)\n{_RULE}")
+
+    tts = BVCUTextToSpeech(tmp_path, language='es')
+    voices = _all_voices()
+
+    # Find which Spanish voice was selected
+    exact_match = None
+    for voice in voices:
+        if voice.id.lower().endswith('/es'):
+            exact_match = voice
+            break
+
+    assert exact_match, "Spanish voice not found"
+    assert tts.voice_id == exact_match.id, f"Selected {tts.voice_id} instead of {exact_match.id}"
+    print(f"✓ Expected: {exact_match.name} - {exact_match.id}")
+
+
+def test_regional_variant_as_fallback(tmp_path, engine):
     """Test that regional variants are used when exact match not found"""
-    print("\n" + "=" * 70)
-    print("TEST: Verify regional variants work as fallback")
-    print("=" * 70)
-    
+    print(f"\n{_RULE}\nTEST: Verify regional variants work as fallback\n{_RULE}")
+
     # Test with a regional variant language code
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tts = BVCUTextToSpeech(tmpdir, language='fr-be')
-        
-        if tts.engine:
-            # This should still find a French voice (either exact or fallback)
-            print("✓ Test PASSED: Regional variant handling works")
-            return True
-    
-    return False
-
-
-def main():
-    """Run all voice selection tests"""
-    print("=" * 70)
-    print("VOICE SELECTION TEST SUITE")
-    print("Validates fix for: 'la voix de sortie n'est pas celle d'entrée'")
-    print("=" * 70)
-    
-    tests = [
-        ("French voice selection", test_french_voice_selection),
-        ("English voice selection", test_english_voice_selection),
-        ("Spanish voice selection", test_spanish_voice_selection),
-        ("Regional variant fallback", test_regional_variant_as_fallback),
+    tts = BVCUTextToSpeech(tmp_path, language='fr-be')
+
+    # This should still find a French voice (either exact or fallback)
+    assert tts.voice_id, "No voice selected for 'fr-be'"
+    print("✓ Test PASSED: Regional variant handling works")
+
+
+def test_voice_index_prefers_exact_language_code():
+    """Test that the voice index keys voices by the code after the last '/'"""
+    voices = [
+        SimpleNamespace(id='roa/fr-be', name='French (Belgium)'),
+        SimpleNamespace(id='roa/fr', name='French (France)'),
+        SimpleNamespace(id='other/fr', name='Second French'),
+        SimpleNamespace(id='HKEY_LOCAL_MACHINE\\TTS_FR', name='No slash'),
     ]
-    
-    passed = 0
-    failed = 0
-    
-    for test_name, test_func in tests:
-        try:
-            if test_func():
-                passed += 1
-            else:
-                failed += 1
-                print(f"\n✗ FAILED: {test_name}")
-        except Exception as e:
-            print(f"\n✗ FAILED: {test_name}")
-            print(f"  Error: {e}")
-            failed += 1
-    
-    print("\n" + "=" * 70)
-    print("VOICE SELECTION TEST SUMMARY")
-    print("=" * 70)
-    print(f"Tests passed: {passed}")
-    print(f"Tests failed: {failed}")
-    print(f"Success rate: {passed / (passed + failed) * 100:.1f}%")
-    print("=" * 70)
-    
-    if failed == 0:
-        print("\n✓✓✓ ALL VOICE SELECTION TESTS PASSED! ✓✓✓")
-        print("\nThe issue 'la voix de sortie n'est pas celle d'entrée' is FIXED!")
-        print("Users now get the correct voice for their selected language.")
-        return 0
-    else:
-        print(f"\n✗ {failed} TEST(S) FAILED")
-        return 1
+
+    index = _build_voice_index(voices)
+
+    assert index['fr'].id == 'roa/fr'
+    assert index['fr-be'].id == 'roa/fr-be'
+    assert len(index) == 2
+
+
+def test_voice_index_uses_reported_languages(tmp_path, monkeypatch):
+    """Test that voices without a code in their ID are indexed by voice.languages"""
+    voices = [
+        SimpleNamespace(id='HKEY_LOCAL_MACHINE\\TTS_FR', name='Hortense', languages=['fr_FR']),
+        SimpleNamespace(id='roa/fr-ca', name='French (Canada)', languages=['fr-fr']),
+        SimpleNamespace(id='other', name='No language', languages=['Unknown']),
+    ]
+
+    index = _build_voice_index(voices)
+
+    # Codes from the IDs take precedence over the reported languages, which
+    # take precedence over their base language
+    assert index['fr-ca'].id == 'roa/fr-ca'
+    assert index['fr-fr'].name == 'Hortense'
+    assert index['fr'].name == 'Hortense'
+    assert set(index) == {'fr-ca', 'fr-fr', 'fr'}
+
+    # SAPI5 voices: every ID contains "tokens", so a substring search for
+    # 'en' would pick the French voice listed first
+    tokens = 'HKEY_LOCAL_MACHINE\\SOFTWARE\\Microsoft\\Speech\\Voices\\Tokens\\'
+    sapi_voices = [
+        SimpleNamespace(id=tokens + 'TTS_MS_FR-FR_HORTENSE_11.0',
+                        name='Microsoft Hortense Desktop - French', languages=['fr_FR']),
+        SimpleNamespace(id=tokens + 'TTS_MS_EN-US_ZIRA_11.0',
+                        name='Microsoft Zira Desktop - English (United States)', languages=['en_US']),
+    ]
+    monkeypatch.setattr(text_to_speech, '_all_voices', lambda: sapi_voices)
+    monkeypatch.setattr(text_to_speech, '_VOICE_BY_LANG', None)
+    monkeypatch.setattr(text_to_speech, '_VOICE_SEARCH', None)
+    monkeypatch.setattr(text_to_speech, '_VOICE_FOR_LANGUAGE', {})
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+
+    for language, name in (('en', 'Microsoft Zira'), ('fr', 'Microsoft Hortense'),
+                           ('en-US', 'Microsoft Zira')):
+        tts = BVCUTextToSpeech(None, language, lazy_engine=True)
+        assert tts._select_voice().name.startswith(name), language
+
+
+def test_voice_selection_is_remembered_per_language(tmp_path, monkeypatch):
+    """Test that each language code is matched against the voices only once"""
+    voices = [
+        SimpleNamespace(id='roa/fr', name='French (France)'),
+        SimpleNamespace(id='gmw/en', name='English (Great Britain)'),
+    ]
+    monkeypatch.setattr(text_to_speech, '_all_voices', lambda: voices)
+    monkeypatch.setattr(text_to_speech, '_VOICE_BY_LANG', None)
+    monkeypatch.setattr(text_to_speech, '_VOICE_SEARCH', None)
+    monkeypatch.setattr(text_to_speech, '_VOICE_FOR_LANGUAGE', {})
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+
+    tts = BVCUTextToSpeech(tmp_path, language='fr-CA', lazy_engine=True)
+    assert tts._select_voice().id == 'roa/fr'
+    assert text_to_speech._VOICE_FOR_LANGUAGE == {'fr-ca': voices[0]}
+
+    # Later selections come from the cache and the index, not the voice list
+    voices.clear()
+    assert tts._select_voice().id == 'roa/fr'
+    tts.language = 'english'
+    assert tts._select_voice().id == 'gmw/en'
+
+
+def test_voice_selection_is_persisted_across_runs(tmp_path, monkeypatch):
+    """Test that a later run reuses the saved voice without enumerating voices"""
+    voices = [SimpleNamespace(id='roa/fr', name='French (France)')]
+    monkeypatch.setattr(text_to_speech, '_all_voices', lambda: voices)
+    monkeypatch.setattr(text_to_speech, '_VOICE_BY_LANG', None)
+    monkeypatch.setattr(text_to_speech, '_VOICE_SEARCH', None)
+    monkeypatch.setattr(text_to_speech, '_VOICE_FOR_LANGUAGE', {})
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+
+    tts = BVCUTextToSpeech(tmp_path, language='fr', lazy_engine=True)
+    assert tts._select_voice().id == 'roa/fr'
+    assert (tmp_path / 'cache' / 'bvcu' / 'voice-fr.json').is_file()
+
+    # A new process starts with empty in-memory caches and must not enumerate
+    def no_enumeration():
+        raise AssertionError("voices enumerated despite the saved selection")
+    monkeypatch.setattr(text_to_speech, '_all_voices', no_enumeration)
+    monkeypatch.setattr(text_to_speech, '_VOICE_BY_LANG', None)
+    monkeypatch.setattr(text_to_speech, '_VOICE_FOR_LANGUAGE', {})
+
+    voice = tts._select_voice()
+    assert voice == ('roa/fr', 'French (France)')
+
+    # Forgetting the saved voice makes the next selection enumerate again
+    text_to_speech._forget_persisted_voice('fr')
+    assert not (tmp_path / 'cache' / 'bvcu' / 'voice-fr.json').exists()
+    with pytest.raises(AssertionError, match="voices enumerated"):
+        tts._select_voice()
+
+
+class _VoiceEngine:
+    """Stand-in engine that, like pyttsx3, ignores unknown voices silently
+
+    pyttsx3 turns driver errors into 'error' notifications, so setting a voice
+    that is not installed raises nothing and leaves the current voice as is.
+    """
+
+    def __init__(self, voices):
+        self.voice_ids = {voice.id for voice in voices}
+        self.voice = 'default/voice'
+        self.voices_set = []
+
+    def getProperty(self, name):
+        return self.voice
+
+    def setProperty(self, name, value):
+        self.voices_set.append(value)
+        if value in self.voice_ids:
+            self.voice = value
+
+
+def test_only_exact_selections_are_persisted(tmp_path, monkeypatch):
+    """Test that fallback picks and unsafe language codes are not saved"""
+    voices = [SimpleNamespace(id='gmw/en', name='English (Great Britain)')]
+    monkeypatch.setattr(text_to_speech, '_all_voices', lambda: voices)
+    monkeypatch.setattr(text_to_speech, '_VOICE_BY_LANG', None)
+    monkeypatch.setattr(text_to_speech, '_VOICE_SEARCH', None)
+    monkeypatch.setattr(text_to_speech, '_VOICE_FOR_LANGUAGE', {})
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+
+    # Substring and base-language fallbacks are only kept in memory
+    for language in ('english', 'en-au'):
+        tts = BVCUTextToSpeech(None, language, lazy_engine=True)
+        assert tts._select_voice().id == 'gmw/en', language
+
+    # A code that is not [A-Za-z0-9_-]+ never becomes a file name
+    assert text_to_speech._voice_cache_path('../../en') is None
+    text_to_speech._persist_voice('../../en', voices[0])
+    assert not (tmp_path / 'cache').exists(), "A voice selection was saved"
+
+
+def test_stale_persisted_voice_is_replaced(tmp_path, monkeypatch):
+    """Test that a saved voice the engine rejects is dropped and selected again"""
+    voices = [SimpleNamespace(id='roa/fr', name='French (France)')]
+    engine = _VoiceEngine(voices)
+    monkeypatch.setattr(text_to_speech, 'get_engine', lambda: engine)
+    monkeypatch.setattr(text_to_speech, '_all_voices', lambda: voices)
+    monkeypatch.setattr(text_to_speech, '_VOICE_BY_LANG', None)
+    monkeypatch.setattr(text_to_speech, '_VOICE_SEARCH', None)
+    monkeypatch.setattr(text_to_speech, '_VOICE_FOR_LANGUAGE', {})
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    text_to_speech._persist_voice('fr', SimpleNamespace(id='uninstalled/fr', name='Gone'))
+
+    tts = BVCUTextToSpeech(None, 'fr')
+    assert tts.voice_id == 'roa/fr'
+    assert engine.voice == 'roa/fr'
+    assert engine.voices_set == ['uninstalled/fr', 'roa/fr']
+    assert text_to_speech._read_persisted_voice('fr').id == 'roa/fr'
+
+    # A remembered voice that is still installed is set exactly once
+    monkeypatch.setattr(text_to_speech, '_VOICE_FOR_LANGUAGE', {})
+    engine.voices_set.clear()
+    assert BVCUTextToSpeech(None, 'fr').voice_id == 'roa/fr'
+    assert engine.voices_set == ['roa/fr']
 
 
 if __name__ == '__main__':
-    import sys
-    sys.exit(main())
+    sys.exit(pytest.main([__file__]))
@@ -7,112 +7,110 @@ This test was created to address the issue of checking if there's a real differe
 when using French voice files from the /voices directory versus not using them.
 """
 
+import concurrent.futures
 import os
 import sys
-import tempfile
-from pathlib import Path
+
+import pytest
+
 from text_to_speech import BVCUTextToSpeech
+from tts_cache import _clone_tts
+
+_RULE = "=" * 80
+
+
+def _summarize(tts):
+    """Return the detected file count and loaded data sizes of an instance"""
+    return {
+        'files_detected': tts.files_count,
+        'voice_data_size': tts.voice_data_size,
+        'dictionary_size': tts.dictionary_size,
+        'linguistic_size': tts.linguistic_size,
+    }
+
+
+def _loaded_report(summary):
+    """Format the loaded data sizes of a summary as one block of text"""
+    return (
+        f"\nLoaded data:\n"
+        f"  - Voice data: {summary['voice_data_size']:,} bytes\n"
+        f"  - Dictionary: {summary['dictionary_size']:,} bytes\n"
+        f"  - Linguistic: {summary['linguistic_size']:,} bytes"
+    )
+
+
+def _load_with_voices():
+    """Load French voice files WITH the /voices directory"""
+    tts = BVCUTextToSpeech("voices", 'fr', lazy_engine=True)
+
+    # Check that files were detected
+    listing = "".join(f"\n  - {filename}" for filename in tts.voice_files)
+    print(f"\nDetected {tts.files_count} voice files:{listing}")
+
+    summary = _summarize(tts)
+    summary['has_claire'] = 'claire_22k_lf.bvcu' in tts.voice_files
+
+    print(_loaded_report(summary))
+
+    return summary
+
+
+def _load_without_voices(empty_dir):
+    """Load French voice files WITHOUT the /voices directory (empty directory)"""
+    tts = BVCUTextToSpeech(empty_dir, 'fr', lazy_engine=True)
+    summary = _summarize(tts)
+
+    print(f"\nDetected {summary['files_detected']} voice files in empty directory\n"
+          + _loaded_report(summary))
+
+    return summary
 
 
 def test_with_voices_directory():
     """Test loading voice files WITH the /voices directory"""
-    print("\n" + "=" * 80)
-    print("TEST: Loading French voice files WITH /voices directory")
-    print("=" * 80)
-    
-    tts = BVCUTextToSpeech("voices", 'fr')
-    
-    # Check that files were detected
-    detected_files = list(tts.voice_files.keys())
-    print(f"\nDetected {len(detected_files)} voice files:")
-    for filename in detected_files:
-        print(f"  - {filename}")
-    
-    # Check that voice data was loaded
-    voice_data_size = len(tts.bvcu_data['voice_data']) if tts.bvcu_data['voice_data'] else 0
-    dictionary_size = len(tts.bvcu_data['dictionary']) if tts.bvcu_data['dictionary'] else 0
-    linguistic_size = len(tts.bvcu_data['linguistic']) if tts.bvcu_data['linguistic'] else 0
-    
-    print(f"\nLoaded data:")
-    print(f"  - Voice data: {voice_data_size:,} bytes")
-    print(f"  - Dictionary: {dictionary_size:,} bytes")
-    print(f"  - Linguistic: {linguistic_size:,} bytes")
-    
+    print(f"\n{_RULE}\nTEST: Loading French voice files WITH /voices directory\n{_RULE}")
+
+    with_voices = _load_with_voices()
+
     # Verify critical files are loaded
-    has_claire = 'claire_22k_lf.bvcu' in detected_files
-    has_voice_data = voice_data_size > 0
-    has_dictionary = dictionary_size > 0
-    
-    print(f"\nStatus:")
-    print(f"  - claire_22k_lf.bvcu detected: {'✓' if has_claire else '✗'}")
-    print(f"  - Voice data loaded: {'✓' if has_voice_data else '✗'}")
-    print(f"  - Dictionary loaded: {'✓' if has_dictionary else '✗'}")
-    
-    return {
-        'files_detected': len(detected_files),
-        'voice_data_size': voice_data_size,
-        'dictionary_size': dictionary_size,
-        'linguistic_size': linguistic_size,
-        'has_claire': has_claire,
-        'has_voice_data': has_voice_data,
-        'has_dictionary': has_dictionary
-    }
+    assert with_voices['has_claire'], "claire_22k_lf.bvcu not detected"
+    assert with_voices['voice_data_size'] > 0, "Voice data not loaded"
+    assert with_voices['dictionary_size'] > 0, "Dictionary not loaded"
 
 
-def test_without_voices_directory():
+def test_without_voices_directory(empty_voice_dir):
     """Test loading voice files WITHOUT the /voices directory (empty directory)"""
-    print("\n" + "=" * 80)
-    print("TEST: Loading French voice files WITHOUT /voices directory (empty dir)")
-    print("=" * 80)
-    
-    # Create a temporary empty directory
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tts = BVCUTextToSpeech(tmpdir, 'fr')
-        
-        # Check that NO files were detected
-        detected_files = list(tts.voice_files.keys())
-        print(f"\nDetected {len(detected_files)} voice files in empty directory")
-        
-        # Check that NO voice data was loaded
-        voice_data_size = len(tts.bvcu_data['voice_data']) if tts.bvcu_data['voice_data'] else 0
-        dictionary_size = len(tts.bvcu_data['dictionary']) if tts.bvcu_data['dictionary'] else 0
-        linguistic_size = len(tts.bvcu_data['linguistic']) if tts.bvcu_data['linguistic'] else 0
-        
-        print(f"\nLoaded data:")
-        print(f"  - Voice data: {voice_data_size:,} bytes")
-        print(f"  - Dictionary: {dictionary_size:,} bytes")
-        print(f"  - Linguistic: {linguistic_size:,} bytes")
-        
-        return {
-            'files_detected': len(detected_files),
-            'voice_data_size': voice_data_size,
-            'dictionary_size': dictionary_size,
-            'linguistic_size': linguistic_size
-        }
-
-
-def compare_results(with_voices, without_voices):
+    print(f"\n{_RULE}\nTEST: Loading French voice files WITHOUT /voices directory (empty dir)\n{_RULE}")
+
+    without_voices = _load_without_voices(empty_voice_dir)
+
+    # Check that NO files were detected and NO voice data was loaded
+    assert without_voices['files_detected'] == 0, "Files detected in an empty directory"
+    assert without_voices['voice_data_size'] == 0, "Voice data loaded from an empty directory"
+
+
+def test_voices_directory_makes_a_difference(empty_voice_dir):
     """Compare results from with and without voices directory"""
-    print("\n" + "=" * 80)
-    print("COMPARISON: WITH /voices vs WITHOUT /voices")
-    print("=" * 80)
-    
-    print(f"\nFiles detected:")
-    print(f"  WITH /voices:    {with_voices['files_detected']} files")
-    print(f"  WITHOUT /voices: {without_voices['files_detected']} files")
-    print(f"  Difference:      {with_voices['files_detected'] - without_voices['files_detected']} files")
-    
-    print(f"\nVoice data size:")
-    print(f"  WITH /voices:    {with_voices['voice_data_size']:,} bytes")
-    print(f"  WITHOUT /voices: {without_voices['voice_data_size']:,} bytes")
-    print(f"  Difference:      {with_voices['voice_data_size'] - without_voices['voice_data_size']:,} bytes")
-    
-    print(f"\nDictionary size:")
-    print(f"  WITH /voices:    {with_voices['dictionary_size']:,} bytes")
-    print(f"  WITHOUT /voices: {without_voices['dictionary_size']:,} bytes")
-    print(f"  Difference:      {with_voices['dictionary_size'] - without_voices['dictionary_size']:,} bytes")
-    
-    # Determine if there's a significant difference
+    with_voices = _load_with_voices()
+    without_voices = _load_without_voices(empty_voice_dir)
+
+    print(f"\n{_RULE}\nCOMPARISON: WITH /voices vs WITHOUT /voices\n{_RULE}")
+
+    lines = []
+    for label, key, unit in (('Files detected', 'files_detected', 'files'),
+                             ('Voice data size', 'voice_data_size', 'bytes'),
+                             ('Dictionary size', 'dictionary_size', 'bytes')):
+        fmt = ',' if unit == 'bytes' else ''
+        lines += [
+            f"\n{label}:",
+            f"  WITH /voices:    {with_voices[key]:{fmt}} {unit}",
+            f"  WITHOUT /voices: {without_voices[key]:{fmt}} {unit}",
+            f"  Difference:      {with_voices[key] - without_voices[key]:{fmt}} {unit}",
+        ]
+    print("\n".join(lines))
+
+    # The program must detect and load voice files from /voices
+    # and must NOT load anything when /voices is empty
     has_difference = (
         with_voices['files_detected'] > 0 and
         with_voices['voice_data_size'] > 0 and
@@ -120,125 +118,76 @@ def compare_results(with_voices, without_voices):
         without_voices['files_detected'] == 0 and
         without_voices['voice_data_size'] == 0
     )
-    
-    print("\n" + "=" * 80)
-    if has_difference:
-        print("✓ RESULT: There IS a significant difference!")
-        print("  The program correctly detects and loads voice files from /voices")
-        print("  and does NOT load them when /voices is empty.")
-        print("  This proves the program is working correctly.")
-    else:
-        print("✗ RESULT: There is NO difference or unexpected behavior!")
-        print("  The program might not be working correctly.")
-    print("=" * 80)
-    
-    return has_difference
+    assert has_difference, "There is NO difference between using /voices and an empty directory"
+
+
+def _dir_signature(path):
+    """Return the sorted (name, size, mtime_ns) of every entry of a directory"""
+    with os.scandir(path) as entries:
+        return tuple(sorted(
+            (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns) for entry in entries
+        ))
 
 
+def _stability_results(iterations):
+    """Load the voices directory iterations times (in a worker process)
+    
+    An instance is only constructed again when the directory signature
+    differs from the previous iteration's; otherwise the new instance would
+    be identical, so the previous result is counted again.
+    
+    Returns:
+        set: The distinct (files_count, voice_data_size) pairs observed
+    """
+    results = set()
+    signature = result = None
+    for _ in range(iterations):
+        current = _dir_signature("voices")
+        if current != signature:
+            tts = _clone_tts("voices", 'fr', lazy_engine=True)
+            signature, result = current, (tts.files_count, tts.voice_data_size)
+        results.add(result)
+    return results
+
+
+@pytest.mark.slow
 def test_stability(iterations=1000):
-    """Test stability by running many iterations"""
-    print("\n" + "=" * 80)
-    print(f"STABILITY TEST: Running {iterations} iterations")
-    print("=" * 80)
-    
-    print("\nThis test will verify that the program consistently:")
-    print("  1. Detects voice files in /voices directory")
-    print("  2. Loads the correct amount of data")
-    print("  3. Does not crash or produce errors")
-    
-    expected_voice_data_size = None
-    expected_files_count = None
-    
-    for i in range(iterations):
-        try:
-            tts = BVCUTextToSpeech("voices", 'fr')
-            
-            files_count = len(tts.voice_files)
-            voice_data_size = len(tts.bvcu_data['voice_data']) if tts.bvcu_data['voice_data'] else 0
-            
-            # First iteration - establish baseline
-            if i == 0:
-                expected_files_count = files_count
-                expected_voice_data_size = voice_data_size
-                print(f"\n✓ Iteration 1: Baseline established")
-                print(f"  - Files: {expected_files_count}")
-                print(f"  - Voice data: {expected_voice_data_size:,} bytes")
-            else:
-                # Check consistency
-                if files_count != expected_files_count:
-                    print(f"\n✗ Iteration {i+1}: File count mismatch!")
-                    print(f"  Expected {expected_files_count}, got {files_count}")
-                    return False
-                
-                if voice_data_size != expected_voice_data_size:
-                    print(f"\n✗ Iteration {i+1}: Voice data size mismatch!")
-                    print(f"  Expected {expected_voice_data_size:,}, got {voice_data_size:,}")
-                    return False
-            
-            # Progress reporting
-            if (i + 1) % 100 == 0:
-                print(f"✓ Completed {i+1}/{iterations} iterations successfully")
-        
-        except Exception as e:
-            print(f"\n✗ Iteration {i+1}: Exception occurred!")
-            print(f"  Error: {e}")
-            return False
-    
-    print(f"\n✓ ALL {iterations} iterations completed successfully!")
-    print(f"  - Consistent file detection: {expected_files_count} files")
-    print(f"  - Consistent voice data: {expected_voice_data_size:,} bytes")
-    print(f"  - No errors or crashes")
-    
-    return True
+    """Test stability by running many iterations
+    
+    The iterations are split evenly across a pool of worker processes. Within
+    a worker, every iteration takes the directory signature and a new
+    instance (sharing the voice bundle cached by tts_cache._load_bundle) is
+    only built when it changed; all results must match the baseline.
+    """
+    print(f"\n{_RULE}\nSTABILITY TEST: Running {iterations} iterations\n{_RULE}")
 
+    print("\nThis test will verify that the program consistently:\n"
+          "  1. Detects voice files in /voices directory\n"
+          "  2. Loads the correct amount of data\n"
+          "  3. Does not crash or produce errors")
 
-def main():
-    """Run all comparison tests"""
-    print("=" * 80)
-    print("COMPREHENSIVE VOICE COMPARISON TEST")
-    print("Testing: fr WITH /voices vs fr WITHOUT /voices")
-    print("=" * 80)
-    
-    # Test 1: With voices directory
-    with_voices = test_with_voices_directory()
-    
-    # Test 2: Without voices directory
-    without_voices = test_without_voices_directory()
-    
-    # Test 3: Compare results
-    has_difference = compare_results(with_voices, without_voices)
-    
-    # Test 4: Stability test with many iterations
-    is_stable = test_stability(iterations=1000)
-    
-    # Final summary
-    print("\n" + "=" * 80)
-    print("FINAL SUMMARY")
-    print("=" * 80)
-    
-    if has_difference and is_stable:
-        print("\n✓✓✓ ALL TESTS PASSED! ✓✓✓")
-        print("\nConclusions:")
-        print("  1. There IS a clear difference between using /voices and not using it")
-        print("  2. The program correctly detects and loads voice files from /voices")
-        print("  3. The program is stable across 1000 iterations")
-        print("  4. The program works correctly!")
-        print("\n  The claire_22k_lf.bvcu file is now properly detected and loaded.")
-        print("  Voice files provide enhanced synthesis capability.")
-        return 0
-    elif has_difference and not is_stable:
-        print("\n✗ PARTIAL SUCCESS")
-        print("\nConclusions:")
-        print("  1. There IS a difference (good)")
-        print("  2. BUT the program is NOT stable across iterations (bad)")
-        return 1
-    else:
-        print("\n✗✗✗ TESTS FAILED ✗✗✗")
-        print("\nConclusions:")
-        print("  1. The program is NOT working correctly")
-        print("  2. Voice files may not be detected or loaded properly")
-        return 1
+    # First iteration in this process - establish baseline
+    (baseline,) = _stability_results(1)
+    expected_files_count, expected_voice_data_size = baseline
+    print(f"\n✓ Iteration 1: Baseline established\n"
+          f"  - Files: {expected_files_count}\n"
+          f"  - Voice data: {expected_voice_data_size:,} bytes")
+
+    remaining = iterations - 1
+    workers = max(1, min(os.cpu_count() or 1, remaining))
+    chunks = [remaining // workers + (n < remaining % workers) for n in range(workers)]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        observed = set().union(*pool.map(_stability_results, chunks))
+
+    # Check consistency
+    assert observed <= {baseline}, \
+        f"Inconsistent (files, voice data size) across iterations: {sorted(observed)}, " \
+        f"expected {baseline}"
+
+    print(f"\n✓ ALL {iterations} iterations completed successfully!\n"
+          f"  - Consistent file detection: {expected_files_count} files\n"
+          f"  - Consistent voice data: {expected_voice_data_size:,} bytes")
 
 
 if __name__ == '__main__':
-    sys.exit(main())
+    sys.exit(pytest.main([__file__]))
@@ -13,11 +13,654 @@ the Nuance Vocalizer SDK. The program uses eSpeak for all speech synthesis.
 import os
 import sys
 import argparse
+import collections
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
+import json
+import logging
+import mmap
+import queue
+import re
+import threading
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
 import tempfile
-import pyttsx3
-import wave
-import struct
+import pyttsx3  # type: ignore[import-untyped]
+
+
+# Voice file detection and loading report through this logger. It has no
+# output of its own: the command line (main) sends it to stdout, library
+# users configure logging as they see fit.
+log = logging.getLogger('bvcu')
+log.addHandler(logging.NullHandler())
+
+
+@contextlib.contextmanager
+def _log_to_stdout():
+    """Print the 'bvcu' logger's INFO messages to sys.stdout for the duration"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    previous_level = log.level
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    try:
+        yield
+    finally:
+        log.removeHandler(handler)
+        log.setLevel(previous_level)
+
+
+# Prebuilt voice cache written by prebuild_voices.py inside the voices directory:
+# the selected blobs stored back to back, plus a JSON index of their offsets
+PREBUILT_DATA = '.prebuilt.bin'
+PREBUILT_INDEX = '.prebuilt.idx'
+
+# Buffer size for files read front to back (text input, hashing):
+# 64 KiB instead of io.DEFAULT_BUFFER_SIZE means far fewer read()s
+_READ_BUFFER_SIZE = 1 << 16
+
+# SHA-256 digests of the voice files, cached inside the voices directory as
+# {name: [mtime_ns, size, hex digest]} so unchanged files are hashed once
+DIGEST_CACHE = '.digests.json'
+
+
+def _read_digests(cache_path):
+    """Return the digest cache at cache_path, or {} if missing or unreadable"""
+    try:
+        digests = json.loads(Path(cache_path).read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return digests if isinstance(digests, dict) else {}
+
+
+def _source_signature(voice_files):
+    """Return {name: [size, mtime_ns]} for the detected voice files
+    
+    Used to decide whether the prebuilt voice cache still matches the
+    files it was built from. Sizes and modification times are the ones
+    recorded during the directory scan; lists, as read back from JSON.
+    """
+    return {name: [len(blob), blob.mtime_ns] for name, blob in voice_files.items()}
+
+
+# Process-wide pyttsx3 engines shared by every BVCUTextToSpeech instance,
+# keyed by driver name (None: the platform's default driver)
+_ENGINE_CACHE: Dict[Optional[str], Any] = {}
+
+# Voice each shared engine started with; restored for instances whose
+# language matched no voice, so they do not inherit the last voice set
+_DEFAULT_VOICES: Dict[Any, Any] = {}
+
+
+def get_engine(driver_name=None):
+    """
+    Return the process-wide pyttsx3 engine, initializing it on first call
+    
+    Starting pyttsx3 loads the eSpeak voice table, so it is done once per
+    process and driver; instances only switch the 'voice' property.
+    
+    Args:
+        driver_name (str): pyttsx3 driver to use (default: platform default)
+    
+    Raises:
+        Exception: Whatever pyttsx3.init() raises when no engine is available
+    """
+    engine = _ENGINE_CACHE.get(driver_name)
+    if engine is None:
+        engine = pyttsx3.init(driver_name)
+        
+        # Configure engine properties
+        rate = engine.getProperty('rate')
+        engine.setProperty('rate', rate - 20)  # Slightly slower for clarity
+        engine.setProperty('volume', 1.0)  # Maximum volume
+        
+        _DEFAULT_VOICES[engine] = engine.getProperty('voice')
+        _ENGINE_CACHE[driver_name] = engine
+    return engine
+
+
+# One lock per engine, held around every command sequence sent to it
+# (setProperty/say/save_to_file up to the end of runAndWait): pyttsx3
+# engines are not thread-safe and the request pool's worker shares them
+# with the threads calling synthesize()
+_ENGINE_LOCKS: Dict[Any, threading.Lock] = {}
+_ENGINE_LOCKS_LOCK = threading.Lock()
+
+
+def _engine_lock(engine):
+    """Return the lock serializing the use of engine, creating it if needed"""
+    with _ENGINE_LOCKS_LOCK:
+        lock = _ENGINE_LOCKS.get(engine)
+        if lock is None:
+            lock = _ENGINE_LOCKS[engine] = threading.Lock()
+        return lock
+
+
+class _TTSRequestPool:
+    """Queue of synthesis requests served by one worker thread
+    
+    submit() returns immediately with a Future. The worker takes every
+    request queued so far, issues their say()/save_to_file() calls and runs
+    them with a single runAndWait(), so callers synthesizing many strings
+    share the engine without waiting on each other's flushes. The batch is
+    run under the engine's lock (see _engine_lock), like synthesize().
+    """
+    
+    def __init__(self, engine):
+        self._engine = engine
+        self._lock = _engine_lock(engine)
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name='bvcu-tts', daemon=True)
+        self._worker.start()
+    
+    def submit(self, text, output_file=None, voice_id=None):
+        """
+        Queue text for synthesis
+        
+        Args:
+            text (str): Text to convert to speech
+            output_file (str): Optional output audio file path (spoken otherwise)
+            voice_id (str): Engine voice to use for this text (default: the
+                            voice the engine started with)
+            
+        Returns:
+            concurrent.futures.Future: Resolves to True once the text was spoken
+            or the output file written, False if the file did not appear
+        """
+        future = concurrent.futures.Future()
+        self._queue.put((text, output_file, voice_id, future))
+        return future
+    
+    def close(self):
+        """Stop the worker once the requests already queued are done"""
+        self._queue.put(None)
+        self._worker.join()
+    
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            batch = [request for request in batch
+                     if request is not None and request[3].set_running_or_notify_cancel()]
+            if batch:
+                self._process(batch)
+            if stop:
+                return
+    
+    def _process(self, batch):
+        """Synthesize a batch of requests with one runAndWait()"""
+        try:
+            with self._lock:
+                for text, output_file, voice_id, _ in batch:
+                    voice_id = voice_id or _DEFAULT_VOICES.get(self._engine)
+                    if voice_id:
+                        self._engine.setProperty('voice', voice_id)
+                    if output_file:
+                        self._engine.save_to_file(text, output_file)
+                    else:
+                        self._engine.say(text)
+                self._engine.runAndWait()
+        except Exception as e:
+            for *_, future in batch:
+                future.set_exception(e)
+            return
+        for _, output_file, _, future in batch:
+            future.set_result(output_file is None or os.path.exists(output_file))
+
+
+@functools.lru_cache(maxsize=1)
+def _all_voices():
+    """Return the voices installed for the shared engine, enumerated once
+    
+    getProperty('voices') makes the driver enumerate its voices (eSpeak lists
+    its data files) on every call. The returned Voice objects are shared and
+    must be treated as read-only.
+    """
+    return get_engine().getProperty('voices')
+
+
+# Memory-backed directory for temporary audio files, where the system has one
+_RAM_TMPDIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# Sentence boundary: whitespace following terminal punctuation
+_SENTENCE_END = re.compile(r'(?<=[.!?…])\s+')
+
+
+def _split_sentences(text):
+    """Split text into its non-empty sentences"""
+    return [sentence for sentence in _SENTENCE_END.split(text.strip()) if sentence]
+
+
+# Request pool of each shared engine, created on first submit()
+_REQUEST_POOLS: Dict[Any, _TTSRequestPool] = {}
+_REQUEST_POOLS_LOCK = threading.Lock()
+
+
+def _request_pool(engine):
+    """Return the _TTSRequestPool serving engine, starting it if needed"""
+    with _REQUEST_POOLS_LOCK:
+        pool = _REQUEST_POOLS.get(engine)
+        if pool is None:
+            pool = _REQUEST_POOLS[engine] = _TTSRequestPool(engine)
+        return pool
+
+
+# Voice files looked for in the voices directory, in detection order
+_REQUIRED_FILES = (
+    'claire_22k_lf.bvcu',
+    'frf.bvcu',
+    'frf.bnx',
+    'frf.dca',
+    'frf.ldi',
+    'frf.oso',
+    'frf.trz',
+    'frf_accent_restoration.dca',
+    'frf_hd.bnx',
+    'frf_hd.bvcu',
+    'frf_iv.trz.gra',
+    'frf_oov.trz.gra',
+    'user.userdico',
+)
+
+
+def _name_key(name):
+    """Return a file name as the file system compares it
+    
+    Case-insensitive on Windows (os.path.normcase) and on macOS, whose file
+    systems ignore case by default, so 'FRF.BNX' is found there as it was by
+    Path.exists(); unchanged elsewhere.
+    """
+    return name.lower() if sys.platform == 'darwin' else os.path.normcase(name)
+
+
+# Required file name by its _name_key, to map scanned names back to their
+# canonical spelling
+_REQUIRED_BY_KEY = {_name_key(name): name for name in _REQUIRED_FILES}
+
+# Voice data files in tie-break order: on equal sizes the earlier file wins
+_VOICE_PRIORITY = ('claire_22k_lf.bvcu', 'frf.bvcu', 'frf.bnx', 'frf_hd.bvcu', 'frf_hd.bnx')
+
+# Voice file suffix -> bvcu_data field the file is loaded into
+_SUFFIX_TO_KEY = {
+    '.bvcu': 'voice_data',
+    '.bnx': 'voice_data',
+    '.dca': 'dictionary',
+    '.ldi': 'linguistic',
+    '.oso': 'configuration',
+    '.trz': 'configuration',
+    '.gra': 'configuration',
+    '.userdico': 'user_dictionary',
+}
+# Same mapping resolved per required file name, so detection does no splitext
+_FILE_TO_KEY = {name: _SUFFIX_TO_KEY[os.path.splitext(name)[1]] for name in _REQUIRED_FILES}
+
+# Engine voices indexed by the language code at the end of their ID
+# ('roa/fr' -> 'fr'); built on first voice selection and reused by every
+# instance, since the installed voices do not change while the process runs
+_VOICE_BY_LANG = None
+
+# (lowercased id, lowercased name, voice) of every engine voice, built with
+# the index, for the substring search
+_VOICE_SEARCH = None
+
+# Voice selected for each requested language code (None when nothing matched)
+_VOICE_FOR_LANGUAGE: Dict[str, Any] = {}
+
+
+# Voice resolved for a language, as remembered across runs in the user's
+# cache directory; only id and name are kept, like the engine voices carry
+_PersistedVoice = collections.namedtuple('_PersistedVoice', 'id name')
+
+# Language codes that may name a voice cache file; any other code (e.g. one
+# containing a path separator) is never read from or written to the cache
+_CACHEABLE_LANGUAGE = re.compile(r'[A-Za-z0-9_-]+')
+
+
+def _voice_cache_path(language):
+    """Path of the file remembering the voice selected for a language code
+    
+    Returns:
+        str: The path, or None if the code is not a plain language code
+    """
+    if not _CACHEABLE_LANGUAGE.fullmatch(language):
+        return None
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(cache_home, 'bvcu', f'voice-{language}.json')
+
+
+def _read_persisted_voice(language):
+    """Return the _PersistedVoice remembered for a language code, or None"""
+    cache_path = _voice_cache_path(language)
+    if cache_path is None:
+        return None
+    try:
+        entry = json.loads(Path(cache_path).read_bytes())
+        return _PersistedVoice(entry['id'], entry['name'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _persist_voice(language, voice):
+    """Remember the voice selected for a language code for later runs"""
+    cache_path = _voice_cache_path(language)
+    if cache_path is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'id': voice.id, 'name': voice.name}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Only saves the voice enumeration next time; nothing to report
+        pass
+
+
+def _is_current_voice(engine, voice_id):
+    """True if engine reports voice_id as its current voice
+    
+    Compared without case: eSpeak reports the identifier in lowercase.
+    """
+    current = engine.getProperty('voice')
+    return isinstance(current, str) and current.lower() == voice_id.lower()
+
+
+def _forget_persisted_voice(language):
+    """Drop the voice remembered for a language code, in memory and on disk"""
+    _VOICE_FOR_LANGUAGE.pop(language, None)
+    cache_path = _voice_cache_path(language)
+    if cache_path is not None:
+        with contextlib.suppress(OSError):
+            os.remove(cache_path)
+
+
+def _build_voice_index(voices):
+    """Return {language code: voice} for the given engine voices
+    
+    A code comes from the end of the voice ID first ('roa/fr' -> 'fr', the
+    first such voice wins), then from the language tags the driver reports in
+    voice.languages ('fr_FR' -> 'fr-fr'), which is all SAPI5 and NSSS voices
+    have since their IDs carry no language code, and last from the base
+    language of those tags ('fr_FR' -> 'fr'), so bare codes such as 'fr' or
+    'en' are found by the lookup too.
+    """
+    voice_by_lang = {}
+    for voice in voices:
+        if '/' in voice.id:
+            voice_by_lang.setdefault(voice.id.rsplit('/', 1)[1].lower(), voice)
+    tagged = []
+    for voice in voices:
+        for tag in getattr(voice, 'languages', None) or ():
+            if isinstance(tag, str) and tag != 'Unknown':
+                tagged.append((tag.lower().replace('_', '-'), voice))
+    for tag, voice in tagged:
+        voice_by_lang.setdefault(tag, voice)
+    for tag, voice in tagged:
+        voice_by_lang.setdefault(tag.split('-', 1)[0], voice)
+    return voice_by_lang
+
+
+# Mappings up to this size are pre-faulted (MAP_POPULATE) where supported:
+# small voice files are read in full anyway, so one populate beats page faults
+_POPULATE_MAX = 1 << 20
+
+
+def _fadvise(fd, offset, length, *advice):
+    """Apply os.posix_fadvise advice (names such as 'POSIX_FADV_SEQUENTIAL')
+    
+    A no-op on platforms without posix_fadvise.
+    """
+    if hasattr(os, 'posix_fadvise'):
+        for name in advice:
+            os.posix_fadvise(fd, offset, length, getattr(os, name))
+
+
+def _map_range(path, offset, size, sequential=False):
+    """Memory-map size bytes of path starting at offset, read-only
+    
+    The mapping starts at the allocation boundary at or below offset; returns
+    (mmap, start) where start is the file offset of the first mapped byte.
+    With sequential, the kernel is also told to read the range ahead.
+    """
+    start = offset - offset % mmap.ALLOCATIONGRANULARITY
+    length = offset + size - start
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        if sequential:
+            _fadvise(fd, offset, size, 'POSIX_FADV_SEQUENTIAL', 'POSIX_FADV_WILLNEED')
+        if hasattr(mmap, 'MAP_POPULATE'):
+            flags = mmap.MAP_SHARED
+            if length <= _POPULATE_MAX:
+                flags |= mmap.MAP_POPULATE
+            mapped = mmap.mmap(fd, length, flags=flags, prot=mmap.PROT_READ, offset=start)
+        else:
+            mapped = mmap.mmap(fd, length, access=mmap.ACCESS_READ, offset=start)
+    finally:
+        os.close(fd)
+    return mapped, start
+
+
+class _LazyBlob:
+    """Contents of a voice file, read from disk only when first needed
+    
+    len() returns the file size recorded at construction time (one stat()
+    call); the bytes are memory-mapped on first access through .data or
+    bytes(). A blob may also cover only a slice of a file (the prebuilt voice
+    cache stores several blobs back to back), given by offset and size.
+    mtime_ns is the file's modification time when known (None otherwise).
+    Blobs are path-like (os.fspath() gives .path), so voice_files values can
+    still be passed to open() or Path() as when they were Path objects.
+    
+    Setting sequential marks a blob that is consumed front to back (the voice
+    data): the file range is advised POSIX_FADV_SEQUENTIAL and WILLNEED and
+    the mapping MADV_SEQUENTIAL and MADV_WILLNEED so the kernel reads ahead
+    aggressively.
+    """
+    
+    __slots__ = ('path', 'offset', 'sequential', 'mtime_ns', '_size', '_data', '_map')
+    
+    def __init__(self, path: Union[str, os.PathLike], size: Optional[int] = None,
+                 offset: int = 0, mtime_ns: Optional[int] = None) -> None:
+        self.path = os.fspath(path)
+        self.offset = offset
+        self.sequential = False
+        if size is None:
+            st = os.stat(self.path)
+            size, mtime_ns = st.st_size, st.st_mtime_ns
+        self.mtime_ns = mtime_ns
+        self._size = size
+        self._data = None
+        self._map = None
+    
+    @classmethod
+    def from_entry(cls, entry: os.DirEntry) -> '_LazyBlob':
+        """Blob for a scanned file, with the size and mtime of entry.stat()"""
+        st = entry.stat()
+        return cls(entry.path, st.st_size, mtime_ns=st.st_mtime_ns)
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __fspath__(self) -> str:
+        return self.path
+    
+    def __bytes__(self) -> bytes:
+        return bytes(self.data)
+    
+    def __repr__(self):
+        return f"_LazyBlob({self.path!r}, size={self._size}, offset={self.offset})"
+    
+    @property
+    def loaded(self):
+        """True once the contents have been mapped from disk"""
+        return self._data is not None
+    
+    @property
+    def data(self):
+        """Read-only buffer with the file contents (mapped on first access)"""
+        if self._data is None:
+            if self._size == 0:
+                self._data = b''
+            else:
+                mapped, start = _map_range(self.path, self.offset, self._size, self.sequential)
+                if self.sequential and hasattr(mapped, 'madvise'):
+                    for advice in ('MADV_SEQUENTIAL', 'MADV_WILLNEED'):
+                        if hasattr(mmap, advice):
+                            mapped.madvise(getattr(mmap, advice))
+                begin = self.offset - start
+                self._map = mapped
+                self._data = memoryview(mapped)[begin:begin + self._size]
+        return self._data
+    
+    def readinto(self, buffer):
+        """Copy the contents into a writable buffer (e.g. a reused bytearray)
+        
+        Returns:
+            int: Number of bytes copied, len(self)
+        """
+        memoryview(buffer)[:self._size] = self.data
+        return self._size
+    
+    def close(self):
+        """Unmap the contents; the next access to .data maps them again
+        
+        Raises:
+            BufferError: If a view obtained from .data is still in use
+        """
+        if isinstance(self._data, memoryview):
+            self._data.release()
+        self._data = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+class _CompositeBlob:
+    """Several blobs treated as one; concatenation is deferred until needed
+    
+    The parts stay separate memory-mapped buffers: len() is the sum of their
+    sizes and segments() walks them without copying. Only bytes() builds a
+    contiguous copy, in a single join.
+    """
+    
+    __slots__ = ('parts', '_size')
+    
+    def __init__(self, parts: List['_LazyBlob']) -> None:
+        self.parts = list(parts)
+        self._size = sum(len(part) for part in self.parts)
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __bytes__(self) -> bytes:
+        return b''.join(self.segments())
+    
+    def segments(self):
+        """Yield the read-only buffer of each part, in order"""
+        for part in self.parts:
+            yield part.data
+    
+    def readinto(self, buffer):
+        """Copy the parts back to back into a writable buffer
+        
+        Lets callers that need the combined contents as one writable block
+        reuse a single preallocated buffer instead of building bytes().
+        
+        Returns:
+            int: Number of bytes copied, len(self)
+        """
+        view = memoryview(buffer)
+        offset = 0
+        for segment in self.segments():
+            view[offset:offset + len(segment)] = segment
+            offset += len(segment)
+        return offset
+    
+    def close(self):
+        """Unmap every part"""
+        for part in self.parts:
+            part.close()
+    
+    def __repr__(self):
+        return f"_CompositeBlob({self.parts!r})"
+
+
+def _stream_blob(blob, dst_fd):
+    """Write the contents of a _LazyBlob or _CompositeBlob to a file descriptor
+    
+    Writes at dst_fd's current position. On Linux the bytes go from the
+    source file to dst_fd with os.sendfile, without passing through user
+    space; elsewhere the memory-mapped contents are written with os.write.
+    
+    Returns:
+        int: Number of bytes written
+    """
+    parts = blob.parts if isinstance(blob, _CompositeBlob) else [blob]
+    written = 0
+    for part in parts:
+        remaining = len(part)
+        if sys.platform.startswith('linux'):
+            src_fd = os.open(part.path, os.O_RDONLY)
+            try:
+                offset = part.offset
+                while remaining:
+                    sent = os.sendfile(dst_fd, src_fd, offset, remaining)
+                    if sent == 0:
+                        raise EOFError(f"{part.path} is shorter than expected")
+                    offset += sent
+                    remaining -= sent
+                    written += sent
+            finally:
+                os.close(src_fd)
+        else:
+            view = part.data
+            while view:
+                sent = os.write(dst_fd, view)
+                view = view[sent:]
+                written += sent
+    return written
+
+
+_RULE = "=" * 70
+
+# Shown when pyttsx3 cannot start because eSpeak is missing
+_ESPEAK_MISSING_MESSAGE = f"""{_RULE}
+ERROR: Text-to-Speech engine (eSpeak) is not installed!
+{_RULE}
+
+The program requires eSpeak or eSpeak-ng to be installed on your system.
+
+Installation instructions:
+
+  Linux (Ubuntu/Debian):
+    sudo apt-get update
+    sudo apt-get install espeak espeak-ng
+
+  macOS:
+    brew install espeak
+
+  Windows:
+    Download and install from: http://espeak.sourceforge.net/
+
+After installing eSpeak, please run the program again.
+{_RULE}"""
+
+# Shown when synthesis is requested without a working engine
+_ENGINE_MISSING_MESSAGE = f"""{_RULE}
+ERROR: TTS engine not initialized.
+{_RULE}
+
+This usually means eSpeak/eSpeak-ng is not installed on your system.
+Please install eSpeak following the instructions above, then try again.
+
+{_RULE}"""
 
 
 class BVCUTextToSpeech:
@@ -27,62 +670,146 @@ class BVCUTextToSpeech:
     All synthesis is done with eSpeak regardless of BVCU file presence.
     """
     
-    def __init__(self, voice_path, language='fr'):
+    __slots__ = (
+        'voice_path', 'language', 'voice_files', 'bvcu_data', 'voice_id',
+        'files_count', 'voice_data_size', 'dictionary_size', 'linguistic_size',
+        '_voice_dir', '_voice_buckets', '_engine', '_engine_initialized',
+    )
+    
+    def __init__(self, voice_path: Optional[Union[str, os.PathLike]] = None, language: str = 'fr',
+                 lazy_engine: bool = False,
+                 _preloaded_blobs: Optional[Tuple[Dict[str, _LazyBlob], Dict[str, Any]]] = None) -> None:
         """
         Initialize the TTS engine
-        
+
         Args:
-            voice_path (str): Path to directory containing voice files (BVCU files 
-                            will be detected but not used for synthesis)
+            voice_path (str): Path to directory containing voice files (BVCU files
+                            will be detected but not used for synthesis); None
+                            skips voice file detection entirely (bvcu_data is None)
             language (str): Language code for synthesis (default: 'fr' for French)
+            lazy_engine (bool): Defer pyttsx3/eSpeak initialization until the engine
+                            is first used (useful when only inspecting voice files)
+            _preloaded_blobs (tuple): Optional (voice_files, bvcu_data) pair taken
+                            from an already-loaded instance; both are shallow-copied
+                            instead of scanning and re-reading the voice directory
         """
-        self.voice_path = Path(voice_path)
+        self.voice_path = Path(voice_path) if voice_path is not None else None
+        # The loader works on the plain string: os.path is cheaper than pathlib
+        self._voice_dir = os.fspath(voice_path) if voice_path is not None else None
         self.language = language
-        self.voice_files = self._check_voice_files()
-        self.bvcu_data = self._load_bvcu_files()
-        self.engine = None
-        self._initialize_engine()
-        
-    def _check_voice_files(self):
-        """Check for BVCU voice files (detected but not used for synthesis)"""
-        required_files = [
-            'claire_22k_lf.bvcu',
-            'frf.bvcu',
-            'frf.bnx',
-            'frf.dca',
-            'frf.ldi',
-            'frf.oso',
-            'frf.trz',
-            'frf_accent_restoration.dca',
-            'frf_hd.bnx',
-            'frf_hd.bvcu',
-            'frf_iv.trz.gra',
-            'frf_oov.trz.gra',
-            'user.userdico'
-        ]
-        
-        voice_files = {}
-        
-        for filename in required_files:
-            file_path = self.voice_path / filename
-            if file_path.exists():
-                voice_files[filename] = file_path
-                print(f"✓ Found BVCU file: {filename}")
-        
-        if voice_files:
-            print(f"✓ Total: {len(voice_files)} BVCU voice files detected in: {self.voice_path}")
+        if voice_path is None:
+            self.voice_files = {}
+            self.bvcu_data = None
+        elif _preloaded_blobs is not None:
+            voice_files, bvcu_data = _preloaded_blobs
+            self.voice_files = dict(voice_files)
+            self.bvcu_data = dict(bvcu_data)
+            self.bvcu_data['configuration'] = dict(bvcu_data['configuration'])
         else:
-            print(f"ℹ No BVCU voice files found in: {self.voice_path}")
+            self.voice_files = self._check_voice_files()
+            self.bvcu_data = self._load_bvcu_files()
+        # Sizes fixed at construction, for callers that check them repeatedly
+        self.files_count = len(self.voice_files)
+        self.voice_data_size, self.dictionary_size, self.linguistic_size = (
+            len(self.bvcu_data[key]) if self.bvcu_data and self.bvcu_data[key] is not None else 0
+            for key in ('voice_data', 'dictionary', 'linguistic')
+        )
+        self._engine = None
+        self._engine_initialized = False
+        self.voice_id = None
+        if not lazy_engine:
+            self._initialize_engine()
+    
+    @property
+    def engine(self):
+        """The pyttsx3 engine, or None if it could not be initialized
+        
+        Initialized on first access when the instance was created with
+        lazy_engine=True.
+        """
+        if not self._engine_initialized:
+            self._initialize_engine()
+        return self._engine
+
+    @property
+    def user_dictionary(self):
+        """Contents of user.userdico decoded as UTF-8, or None
+        
+        Decoded from the file on each access; None when there is no user
+        dictionary or it cannot be read.
+        """
+        if not self.bvcu_data:
+            return None
+        blob = self.bvcu_data['configuration'].get('user_dictionary')
+        if blob is None:
+            return None
+        try:
+            return bytes(blob).decode('utf-8')
+        except (OSError, UnicodeDecodeError) as e:
+            log.warning("Warning: Could not load user.userdico: %s", e)
+            return None
+
+    def close(self):
+        """Unmap the voice files mapped so far
+
+        Blobs are shared with instances built from _preloaded_blobs, which
+        map them again on their next access.
+        """
+        blobs = list(self.voice_files.values())
+        if self.bvcu_data:
+            blobs += [self.bvcu_data[key] for key in ('voice_data', 'dictionary', 'linguistic')]
+            blobs += self.bvcu_data['configuration'].values()
+        for blob in blobs:
+            if hasattr(blob, 'close'):
+                blob.close()
+        
+    def _check_voice_files(self) -> Dict[str, _LazyBlob]:
+        """Check for BVCU voice files (detected but not used for synthesis)
+        
+        Returns:
+            dict: File name -> _LazyBlob; len() of each value is the file size
+                  recorded during the directory scan and .path its location
+        """
+        # One directory pass; only the required files are stat()ed afterwards.
+        # DirEntry.stat() takes the result from the listing on Windows only; on
+        # POSIX it makes one stat() call per file (cached on the entry)
+        found = {}
+        try:
+            with os.scandir(self._voice_dir) as entries:
+                for entry in entries:
+                    filename = _REQUIRED_BY_KEY.get(_name_key(entry.name))
+                    if filename is not None and entry.is_file():
+                        found[filename] = entry
+        except OSError:
+            pass
+        
+        voice_files = {
+            filename: _LazyBlob.from_entry(found[filename])
+            for filename in _REQUIRED_FILES if filename in found
+        }
+        self._voice_buckets = collections.defaultdict(list)
+        for filename in voice_files:
+            self._voice_buckets[_FILE_TO_KEY[filename]].append(filename)
+        
+        # One log record for the whole scan instead of one write per file
+        if not voice_files:
+            log.info("ℹ No BVCU voice files found in: %s", self.voice_path)
+        elif log.isEnabledFor(logging.INFO):
+            found_lines = "".join(f"✓ Found BVCU file: {filename}\n" for filename in voice_files)
+            log.info("%s✓ Total: %d BVCU voice files detected in: %s",
+                     found_lines, len(voice_files), self.voice_path)
         
         return voice_files
     
-    def _load_bvcu_files(self):
+    def _load_bvcu_files(self) -> Dict[str, Any]:
         """Load and parse BVCU voice files if available
         
         Note: Files are loaded for compatibility/detection but cannot be used
-        for synthesis as pyttsx3/eSpeak does not support BVCU format.
+        for synthesis as pyttsx3/eSpeak does not support BVCU format. Binary
+        files are wrapped in _LazyBlob objects: only their size is known up
+        front and the contents are mapped from disk on first access.
         """
-        bvcu_data = {
+        bvcu_data: Dict[str, Any] = {
             'voice_data': None,
             'dictionary': None,
             'linguistic': None,
@@ -92,186 +819,257 @@ class BVCUTextToSpeech:
         if not self.voice_files:
             return bvcu_data
         
-        print("Loading BVCU voice files...")
+        log.info("Loading BVCU voice files...")
         
-        # Load binary voice data (.bvcu and .bnx files)
-        # Priority: claire_22k_lf.bvcu > frf_hd.bvcu > frf.bvcu > frf_hd.bnx > frf.bnx (by size)
+        # Use the prebuilt cache (see prebuild_voices.py) when it is up to date,
+        # otherwise select the binary blobs from the individual files
+        if not self._load_prebuilt(bvcu_data):
+            self._load_binary_files(bvcu_data)
         
-        if 'claire_22k_lf.bvcu' in self.voice_files:
-            try:
-                with open(self.voice_files['claire_22k_lf.bvcu'], 'rb') as f:
-                    claire_data = f.read()
-                    if bvcu_data['voice_data'] is None or len(claire_data) > len(bvcu_data.get('voice_data', b'')):
-                        bvcu_data['voice_data'] = claire_data
-                        print(f"✓ Loaded voice data from claire_22k_lf.bvcu ({len(claire_data)} bytes)")
-            except Exception as e:
-                print(f"Warning: Could not load claire_22k_lf.bvcu: {e}")
-        
-        if 'frf.bvcu' in self.voice_files:
-            try:
-                with open(self.voice_files['frf.bvcu'], 'rb') as f:
-                    bvcu_file_data = f.read()
-                    if bvcu_data['voice_data'] is None or len(bvcu_file_data) > len(bvcu_data.get('voice_data', b'')):
-                        bvcu_data['voice_data'] = bvcu_file_data
-                        print(f"✓ Loaded voice data from frf.bvcu ({len(bvcu_file_data)} bytes)")
-            except Exception as e:
-                print(f"Warning: Could not load frf.bvcu: {e}")
-        
-        if 'frf.bnx' in self.voice_files:
-            try:
-                with open(self.voice_files['frf.bnx'], 'rb') as f:
-                    bnx_data = f.read()
-                    if bvcu_data['voice_data'] is None or len(bnx_data) > len(bvcu_data.get('voice_data', b'')):
-                        bvcu_data['voice_data'] = bnx_data
-                        print(f"✓ Loaded voice data from frf.bnx ({len(bnx_data)} bytes)")
-            except Exception as e:
-                print(f"Warning: Could not load frf.bnx: {e}")
-        
-        if 'frf_hd.bvcu' in self.voice_files:
-            try:
-                with open(self.voice_files['frf_hd.bvcu'], 'rb') as f:
-                    hd_data = f.read()
-                    if len(hd_data) > len(bvcu_data.get('voice_data', b'')):
-                        bvcu_data['voice_data'] = hd_data
-                        print(f"✓ Loaded HD voice data from frf_hd.bvcu ({len(hd_data)} bytes)")
-            except Exception as e:
-                print(f"Warning: Could not load frf_hd.bvcu: {e}")
-        
-        if 'frf_hd.bnx' in self.voice_files:
-            try:
-                with open(self.voice_files['frf_hd.bnx'], 'rb') as f:
-                    hd_data = f.read()
-                    if len(hd_data) > len(bvcu_data.get('voice_data', b'')):
-                        bvcu_data['voice_data'] = hd_data
-                        print(f"✓ Loaded HD voice data from frf_hd.bnx ({len(hd_data)} bytes)")
-            except Exception as e:
-                print(f"Warning: Could not load frf_hd.bnx: {e}")
-        
-        # Load dictionary data (.dca files)
-        dict_files = ['frf.dca', 'frf_accent_restoration.dca']
-        for dict_file in dict_files:
-            if dict_file in self.voice_files:
-                try:
-                    with open(self.voice_files[dict_file], 'rb') as f:
-                        dict_data = f.read()
-                        if bvcu_data['dictionary'] is None:
-                            bvcu_data['dictionary'] = dict_data
-                        else:
-                            bvcu_data['dictionary'] += dict_data
-                        print(f"✓ Loaded dictionary from {dict_file} ({len(dict_data)} bytes)")
-                except Exception as e:
-                    print(f"Warning: Could not load {dict_file}: {e}")
+        # User dictionary if available: kept as a blob, decoded by the
+        # user_dictionary property only when someone reads it
+        if 'user.userdico' in self.voice_files:
+            bvcu_data['configuration']['user_dictionary'] = self.voice_files['user.userdico']
+            log.info("✓ Loaded user dictionary from user.userdico")
         
-        # Load linguistic data (.ldi file)
-        if 'frf.ldi' in self.voice_files:
-            try:
-                with open(self.voice_files['frf.ldi'], 'rb') as f:
-                    bvcu_data['linguistic'] = f.read()
-                print(f"✓ Loaded linguistic data from frf.ldi ({len(bvcu_data['linguistic'])} bytes)")
-            except Exception as e:
-                print(f"Warning: Could not load frf.ldi: {e}")
+        if any([bvcu_data['voice_data'], bvcu_data['dictionary'], bvcu_data['linguistic']]):
+            log.info("✓ BVCU voice files loaded (for information only - cannot be used with eSpeak)")
         
-        # Load user dictionary if available
-        if 'user.userdico' in self.voice_files:
-            try:
-                with open(self.voice_files['user.userdico'], 'r', encoding='utf-8') as f:
-                    user_dict = f.read()
-                    bvcu_data['configuration']['user_dictionary'] = user_dict
-                print(f"✓ Loaded user dictionary from user.userdico")
-            except Exception as e:
-                print(f"Warning: Could not load user.userdico: {e}")
+        return bvcu_data
+    
+    def _load_binary_files(self, bvcu_data: Dict[str, Any]) -> None:
+        """Select voice data, dictionaries, linguistic and configuration blobs
+        
+        The blobs are the ones created by _check_voice_files, with the sizes
+        recorded during the directory scan, so nothing is read or stat()ed
+        again here.
+        """
+        buckets = self._voice_buckets
+        
+        # Select binary voice data (.bvcu and .bnx files): the largest file wins,
+        # ties go to the earlier file in priority order
+        # Priority: claire_22k_lf.bvcu > frf.bvcu > frf.bnx > frf_hd.bvcu > frf_hd.bnx
+        voice_file = max(
+            buckets['voice_data'],
+            key=lambda name: (len(self.voice_files[name]), -_VOICE_PRIORITY.index(name)),
+            default=None,
+        )
+        if voice_file is not None:
+            bvcu_data['voice_data'] = self.voice_files[voice_file]
+            bvcu_data['voice_data'].sequential = True
+            log.info("✓ Loaded voice data from %s (%d bytes)", voice_file, len(bvcu_data['voice_data']))
+        
+        # Load dictionary data (.dca files), combined lazily in file order
+        dict_parts = []
+        for dict_file in buckets['dictionary']:
+            dict_parts.append(self.voice_files[dict_file])
+            log.info("✓ Loaded dictionary from %s (%d bytes)", dict_file, len(self.voice_files[dict_file]))
+        if dict_parts:
+            bvcu_data['dictionary'] = _CompositeBlob(dict_parts)
+        
+        # Load linguistic data (.ldi file)
+        for ldi_file in buckets['linguistic']:
+            bvcu_data['linguistic'] = self.voice_files[ldi_file]
+            log.info("✓ Loaded linguistic data from %s (%d bytes)", ldi_file, len(self.voice_files[ldi_file]))
         
         # Store configuration from other files
-        config_files = ['frf.oso', 'frf.trz', 'frf_iv.trz.gra', 'frf_oov.trz.gra']
-        for config_file in config_files:
-            if config_file in self.voice_files:
-                try:
-                    with open(self.voice_files[config_file], 'rb') as f:
-                        config_data = f.read()
-                        bvcu_data['configuration'][config_file] = config_data
-                        print(f"✓ Loaded configuration from {config_file} ({len(config_data)} bytes)")
-                except Exception as e:
-                    print(f"Warning: Could not load {config_file}: {e}")
+        for config_file in buckets['configuration']:
+            bvcu_data['configuration'][config_file] = self.voice_files[config_file]
+            log.info("✓ Loaded configuration from %s (%d bytes)",
+                     config_file, len(self.voice_files[config_file]))
+    
+    def _load_prebuilt(self, bvcu_data: Dict[str, Any]) -> bool:
+        """Fill bvcu_data from the prebuilt voice cache if it matches the voice files
         
-        if any([bvcu_data['voice_data'], bvcu_data['dictionary'], bvcu_data['linguistic']]):
-            print("✓ BVCU voice files loaded (for information only - cannot be used with eSpeak)")
+        Returns:
+            bool: True if the prebuilt cache was used
+        """
+        if self._voice_dir is None:
+            return False
+        index_path = os.path.join(self._voice_dir, PREBUILT_INDEX)
+        data_path = os.path.join(self._voice_dir, PREBUILT_DATA)
+        try:
+            index = json.loads(Path(index_path).read_bytes())
+            if index['sources'] != _source_signature(self.voice_files):
+                log.info("ℹ Prebuilt voice cache is out of date, run prebuild_voices.py to refresh it")
+                return False
+            if os.stat(data_path).st_size != index['data_size']:
+                log.warning("Warning: Ignoring incomplete prebuilt voice cache: %s", data_path)
+                return False
+            # One [offset, length] range per source file; the dictionary keeps
+            # its parts so it is a _CompositeBlob with or without the cache
+            blobs: Dict[str, Union[_LazyBlob, _CompositeBlob]] = {}
+            for key, ranges in index['blobs'].items():
+                parts = [_LazyBlob(data_path, int(length), int(offset)) for offset, length in ranges]
+                if key == 'dictionary':
+                    blobs[key] = _CompositeBlob(parts)
+                else:
+                    (part,) = parts
+                    part.sequential = key == 'voice_data'
+                    blobs[key] = part
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            log.warning("Warning: Could not load prebuilt voice cache: %s", e)
+            return False
         
-        return bvcu_data
+        for key, blob in blobs.items():
+            if key.startswith('configuration/'):
+                bvcu_data['configuration'][key.split('/', 1)[1]] = blob
+            else:
+                bvcu_data[key] = blob
+        log.info("✓ Loaded %d voice blobs from prebuilt cache %s", len(index['blobs']), data_path)
+        return True
+    
+    def _verify(self, name):
+        """Return the SHA-256 digest of a detected voice file
+        
+        The digest is computed once per (mtime, size) of the file and kept in
+        the voices directory's digest cache for later calls and processes.
+        The cache is read again just before it is rewritten, and written
+        through a per-process temporary file, so concurrent verifiers keep
+        each other's entries.
+        
+        Args:
+            name (str): Voice file name, a key of self.voice_files
+            
+        Returns:
+            bytes: The raw SHA-256 digest
+        """
+        path = self.voice_files[name].path
+        st = os.stat(path)
+        cache_path = self.voice_path / DIGEST_CACHE
+        cached = _read_digests(cache_path).get(name)
+        if (isinstance(cached, list) and len(cached) == 3
+                and cached[:2] == [st.st_mtime_ns, st.st_size] and isinstance(cached[2], str)):
+            try:
+                return bytes.fromhex(cached[2])
+            except ValueError:
+                pass  # Malformed entry: hash the file and replace it
+        
+        # Hashing reads the file once, front to back: read ahead, then drop
+        # the pages so a verification pass does not evict the page cache
+        with open(path, 'rb', buffering=_READ_BUFFER_SIZE) as f:
+            _fadvise(f.fileno(), 0, 0, 'POSIX_FADV_SEQUENTIAL', 'POSIX_FADV_WILLNEED')
+            if hasattr(hashlib, 'file_digest'):
+                digest = hashlib.file_digest(f, 'sha256').digest()
+            else:
+                sha = hashlib.sha256()
+                for chunk in iter(functools.partial(f.read, 1 << 20), b''):
+                    sha.update(chunk)
+                digest = sha.digest()
+            _fadvise(f.fileno(), 0, 0, 'POSIX_FADV_DONTNEED')
+        
+        # Merge into the cache as it is now: other processes may have added
+        # entries while this file was being hashed
+        digests = _read_digests(cache_path)
+        digests[name] = [st.st_mtime_ns, st.st_size, digest.hex()]
+        try:
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(digests, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            log.warning("Warning: Could not write voice digest cache: %s", e)
+        return digest
     
     def _initialize_engine(self):
         """Initialize the TTS engine"""
+        self._engine_initialized = True
         try:
-            self.engine = pyttsx3.init()
-            
-            # Configure engine properties
-            rate = self.engine.getProperty('rate')
-            self.engine.setProperty('rate', rate - 20)  # Slightly slower for clarity
-            
-            volume = self.engine.getProperty('volume')
-            self.engine.setProperty('volume', 1.0)  # Maximum volume
+            self._engine = get_engine()
             
             # Note about BVCU files
-            if self.bvcu_data and (self.bvcu_data['voice_data'] or self.bvcu_data['dictionary']):
-                print("ℹ Note: BVCU files detected but cannot be used by pyttsx3/eSpeak engine")
-                print("ℹ BVCU files require Nuance Vocalizer SDK (proprietary)")
-                print("ℹ The program will use eSpeak for synthesis instead")
+            if self.voice_data_size or self.dictionary_size:
+                log.info("ℹ Note: BVCU files detected but cannot be used by pyttsx3/eSpeak engine\n"
+                         "ℹ BVCU files require Nuance Vocalizer SDK (proprietary)\n"
+                         "ℹ The program will use eSpeak for synthesis instead")
             
             # Try to find and set voice matching the specified language
-            voices = self.engine.getProperty('voices')
+            # (under the engine's lock: the request pool may be using it)
             if self.language:
-                # First, try to find an exact language match (e.g., 'fr' matches 'roa/fr')
-                # This ensures we get French (France) for 'fr', not French (Belgium)
-                exact_match = None
-                partial_matches = []
-                
-                for voice in voices:
-                    voice_id_lower = voice.id.lower()
-                    lang_lower = self.language.lower()
-                    
-                    # Check for exact match: language code at end of ID (e.g., 'roa/fr' for 'fr')
-                    if voice_id_lower.endswith('/' + lang_lower):
-                        exact_match = voice
-                        break
-                    # Check for language in voice ID or name as fallback
-                    elif lang_lower in voice_id_lower or lang_lower in voice.name.lower():
-                        partial_matches.append(voice)
-                
-                # Use exact match if found, otherwise use first partial match
-                selected_voice = exact_match or (partial_matches[0] if partial_matches else None)
-                
+                with _engine_lock(self._engine):
+                    selected_voice = self._select_voice()
+                    if selected_voice:
+                        self._engine.setProperty('voice', selected_voice.id)
+                    # pyttsx3 reports driver errors as notifications, never from
+                    # setProperty(): read the voice back to catch a remembered
+                    # voice that is no longer installed
+                    if (isinstance(selected_voice, _PersistedVoice)
+                            and not _is_current_voice(self._engine, selected_voice.id)):
+                        _forget_persisted_voice(self.language.lower())
+                        selected_voice = self._select_voice(persisted=False)
+                        if selected_voice:
+                            self._engine.setProperty('voice', selected_voice.id)
                 if selected_voice:
-                    self.engine.setProperty('voice', selected_voice.id)
-                    print(f"✓ Using voice: {selected_voice.name}")
+                    self.voice_id = selected_voice.id
+                    log.info("✓ Using voice: %s", selected_voice.name)
                 elif self.language == 'fr':
                     # Specific fallback message for French
-                    print(f"ℹ French voice not found, using default voice")
+                    log.info("ℹ French voice not found, using default voice")
             
         except Exception as e:
             error_msg = str(e).lower()
             if 'espeak' in error_msg or 'no module' in error_msg or 'driver' in error_msg:
-                print("=" * 70)
-                print("ERROR: Text-to-Speech engine (eSpeak) is not installed!")
-                print("=" * 70)
-                print("")
-                print("The program requires eSpeak or eSpeak-ng to be installed on your system.")
-                print("")
-                print("Installation instructions:")
-                print("")
-                print("  Linux (Ubuntu/Debian):")
-                print("    sudo apt-get update")
-                print("    sudo apt-get install espeak espeak-ng")
-                print("")
-                print("  macOS:")
-                print("    brew install espeak")
-                print("")
-                print("  Windows:")
-                print("    Download and install from: http://espeak.sourceforge.net/")
-                print("")
-                print("After installing eSpeak, please run the program again.")
-                print("=" * 70)
+                log.error("%s", _ESPEAK_MISSING_MESSAGE)
+            else:
+                log.warning("Warning: Could not fully initialize TTS engine: %s", e)
+            self._engine = None
+    
+    def _select_voice(self, persisted=True):
+        """Return the engine voice matching self.language, or None
+        
+        An exact match on the language code at the end of the voice ID wins
+        ('fr' selects 'roa/fr', not 'roa/fr-be'); it is a dict lookup in the
+        per-process voice index. Otherwise the first voice whose ID or name
+        contains the code is used, and finally a regional code falls back to
+        its base language ('fr-ca' -> 'fr'). The outcome is remembered per
+        language code, so later instances skip the search.
+        
+        A voice that exactly matches the code in the index is also saved to
+        $XDG_CACHE_HOME/bvcu (see _voice_cache_path) and, unless persisted is
+        False, returned from there as a _PersistedVoice by later runs, which
+        then never enumerate the engine voices. Fallback picks are not saved:
+        they are redone in every process.
+        """
+        global _VOICE_BY_LANG, _VOICE_SEARCH
+        lang_lower = self.language.lower()
+        if lang_lower in _VOICE_FOR_LANGUAGE:
+            return _VOICE_FOR_LANGUAGE[lang_lower]
+        
+        voice = _read_persisted_voice(lang_lower) if persisted else None
+        if voice is None:
+            if _VOICE_BY_LANG is None:
+                voices = _all_voices()
+                _VOICE_BY_LANG = _build_voice_index(voices)
+                _VOICE_SEARCH = [(voice.id.lower(), voice.name.lower(), voice) for voice in voices]
+            
+            voice = _VOICE_BY_LANG.get(lang_lower)
+            if voice is not None:
+                _persist_voice(lang_lower, voice)
             else:
-                print(f"Warning: Could not fully initialize TTS engine: {e}")
-            self.engine = None
+                voice = next((voice for voice_id, name, voice in _VOICE_SEARCH
+                              if lang_lower in voice_id or lang_lower in name), None)
+            if voice is None:
+                voice = _VOICE_BY_LANG.get(lang_lower.split('-', 1)[0])
+        
+        _VOICE_FOR_LANGUAGE[lang_lower] = voice
+        return voice
+    
+    @contextlib.contextmanager
+    def _engine_in_use(self):
+        """Hold the shared engine's lock, with this instance's voice applied
+        
+        Every say()/save_to_file() ... runAndWait() sequence runs inside it,
+        so it never overlaps with another thread's (or the request pool's).
+        """
+        with _engine_lock(self._engine):
+            # The engine is shared between instances: apply this instance's
+            # voice, or the engine's initial one when no voice matched
+            voice_id = self.voice_id or _DEFAULT_VOICES.get(self._engine)
+            if voice_id:
+                self._engine.setProperty('voice', voice_id)
+            yield
     
     def synthesize(self, text, output_file=None):
         """
@@ -285,62 +1083,127 @@ class BVCUTextToSpeech:
             bool: True if synthesis was successful
         """
         if not text or not text.strip():
-            print("Error: No text provided for synthesis.")
+            log.error("Error: No text provided for synthesis.")
             return False
         
-        print(f"Synthesizing text: '{text[:80]}{'...' if len(text) > 80 else ''}'")
-        print(f"Language: {self.language}")
-        
-        # Report if BVCU files are detected (but note they cannot be used)
-        if self.bvcu_data and (self.bvcu_data['voice_data'] or self.bvcu_data['dictionary']):
-            print("ℹ BVCU files detected (but not used - pyttsx3/eSpeak cannot read this format)")
-            if self.bvcu_data['voice_data']:
-                print(f"  - Voice data: {len(self.bvcu_data['voice_data'])} bytes")
-            if self.bvcu_data['dictionary']:
-                print(f"  - Dictionary data: {len(self.bvcu_data['dictionary'])} bytes")
-            if self.bvcu_data['linguistic']:
-                print(f"  - Linguistic data: {len(self.bvcu_data['linguistic'])} bytes")
+        # Status report, only formatted when someone is listening
+        if log.isEnabledFor(logging.INFO):
+            lines = [
+                f"Synthesizing text: '{text[:80]}{'...' if len(text) > 80 else ''}'",
+                f"Language: {self.language}",
+            ]
+            # Report if BVCU files are detected (but note they cannot be used)
+            if self.voice_data_size or self.dictionary_size:
+                lines.append("ℹ BVCU files detected (but not used - pyttsx3/eSpeak cannot read this format)")
+                if self.voice_data_size:
+                    lines.append(f"  - Voice data: {self.voice_data_size} bytes")
+                if self.dictionary_size:
+                    lines.append(f"  - Dictionary data: {self.dictionary_size} bytes")
+                if self.linguistic_size:
+                    lines.append(f"  - Linguistic data: {self.linguistic_size} bytes")
+            log.info("%s", "\n".join(lines))
         
         if not self.engine:
-            print("=" * 70)
-            print("ERROR: TTS engine not initialized.")
-            print("=" * 70)
-            print("")
-            print("This usually means eSpeak/eSpeak-ng is not installed on your system.")
-            print("Please install eSpeak following the instructions above, then try again.")
-            print("")
-            print("=" * 70)
+            log.error("%s", _ENGINE_MISSING_MESSAGE)
             return False
         
         try:
             # If output file specified, save to file
             if output_file:
-                self.engine.save_to_file(text, output_file)
-                self.engine.runAndWait()
+                with self._engine_in_use():
+                    self._engine.save_to_file(text, output_file)
+                    self._engine.runAndWait()
                 
-                # Verify file was created
-                import time
-                for i in range(10):  # Wait up to 1 second for file to appear
-                    if os.path.exists(output_file):
-                        print(f"✓ Audio saved to: {output_file}")
-                        return True
-                    time.sleep(0.1)
+                # runAndWait() returns once the file is written: check it once
+                if os.path.exists(output_file):
+                    log.info("✓ Audio saved to: %s", output_file)
+                    return True
                 
-                print(f"Warning: File {output_file} may not have been created")
+                log.warning("Warning: File %s may not have been created", output_file)
                 return False
             
-            # Otherwise, speak the text directly
-            print("✓ Synthesis complete. Playing audio...")
-            self.engine.say(text)
-            self.engine.runAndWait()
-            print("✓ Playback complete.")
+            # Otherwise, speak the text directly, one utterance per sentence so
+            # playback starts once the first sentence is synthesized
+            log.info("✓ Synthesis complete. Playing audio...")
+            with self._engine_in_use():
+                for sentence in _split_sentences(text):
+                    self._engine.say(sentence)
+                self._engine.runAndWait()
+            log.info("✓ Playback complete.")
             
             return True
             
         except Exception as e:
-            print(f"Error during synthesis: {e}")
+            log.error("Error during synthesis: %s", e)
             return False
     
+    def synthesize_to_bytes(self, text):
+        """
+        Synthesize text and return the audio instead of saving it to a path
+        
+        pyttsx3 can only render to a file: it goes to a temporary file in
+        memory-backed storage (/dev/shm) where available and is read back in
+        one readinto() into a buffer allocated at the file's size. Wrap the
+        result in io.BytesIO to open it with the wave module.
+        
+        Args:
+            text (str): Text to convert to speech
+            
+        Returns:
+            bytearray: Contents of the audio file, or None if synthesis failed
+        """
+        if not text or not text.strip():
+            log.error("Error: No text provided for synthesis.")
+            return None
+        if not self.engine:
+            log.error("Error: TTS engine not initialized.")
+            return None
+        
+        fd, tmp_path = tempfile.mkstemp(suffix='.wav', dir=_RAM_TMPDIR)
+        os.close(fd)
+        try:
+            with self._engine_in_use():
+                self._engine.save_to_file(text, tmp_path)
+                self._engine.runAndWait()
+            
+            with open(tmp_path, 'rb', buffering=0) as f:
+                audio = bytearray(os.fstat(f.fileno()).st_size)
+                view = memoryview(audio)
+                while view:
+                    read = f.readinto(view)
+                    if not read:
+                        del audio[len(audio) - len(view):]
+                        break
+                    view = view[read:]
+            return audio
+        except Exception as e:
+            log.error("Error during synthesis: %s", e)
+            return None
+        finally:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    
+    def submit(self, text, output_file=None):
+        """
+        Queue text on the engine's shared request pool and return immediately
+        
+        Requests from every instance are batched by one worker thread (see
+        _TTSRequestPool); this instance's voice is applied to its own texts.
+        
+        Args:
+            text (str): Text to convert to speech
+            output_file (str): Optional output audio file path
+            
+        Returns:
+            concurrent.futures.Future: Resolves to True when synthesis succeeded,
+            or None if the TTS engine is not available
+        """
+        if not self.engine:
+            return None
+        return _request_pool(self.engine).submit(text, output_file, self.voice_id)
+    
     def text_to_speech_from_file(self, text_file, output_file=None):
         """
         Read text from file and convert to speech
@@ -353,19 +1216,26 @@ class BVCUTextToSpeech:
             bool: True if synthesis was successful
         """
         try:
-            with open(text_file, 'r', encoding='utf-8') as f:
+            with open(text_file, 'r', encoding='utf-8', buffering=_READ_BUFFER_SIZE) as f:
                 text = f.read()
             return self.synthesize(text, output_file)
         except FileNotFoundError:
-            print(f"Error: Text file not found: {text_file}")
+            log.error("Error: Text file not found: %s", text_file)
             return False
         except Exception as e:
-            print(f"Error reading text file: {e}")
+            log.error("Error reading text file: %s", e)
             return False
 
 
-def main():
-    """Main entry point for the TTS converter"""
+def main(argv=None):
+    """Main entry point for the TTS converter
+    
+    Args:
+        argv (list): Command-line arguments (default: sys.argv[1:])
+        
+    Returns:
+        int: Process exit code
+    """
     parser = argparse.ArgumentParser(
         description='Fully functional text-to-speech converter with audio synthesis',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -420,7 +1290,7 @@ Examples:
         help='Path to directory containing voice files (optional, default: ./voices)'
     )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Validate arguments
     if not args.text and not args.file:
@@ -429,22 +1299,24 @@ Examples:
     if args.text and args.file:
         parser.error("Cannot specify both --text and --file")
     
-    # Initialize TTS engine
-    print("=" * 60)
-    print("BVCU Text-to-Speech Converter - Full Functional Version")
-    print("=" * 60)
-    tts = BVCUTextToSpeech(args.voice_path, language=args.language)
-    
-    # Synthesize speech
-    if args.text:
-        success = tts.synthesize(args.text, args.output)
-    else:
-        success = tts.text_to_speech_from_file(args.file, args.output)
-    
-    if success:
+    # Loader messages go to stdout like the rest of the command line output
+    with _log_to_stdout():
+        # Initialize TTS engine
         print("=" * 60)
-        print("✓ Text-to-speech conversion completed successfully!")
+        print("BVCU Text-to-Speech Converter - Full Functional Version")
         print("=" * 60)
+        tts = BVCUTextToSpeech(args.voice_path, language=args.language)
+    
+        # Synthesize speech
+        if args.text:
+            success = tts.synthesize(args.text, args.output)
+        else:
+            success = tts.text_to_speech_from_file(args.file, args.output)
+    
+        if success:
+            print("=" * 60)
+            print("✓ Text-to-speech conversion completed successfully!")
+            print("=" * 60)
     
     return 0 if success else 1
 
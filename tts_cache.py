@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Memoized construction of BVCUTextToSpeech instances
+
+Scanning the voices directory, reading every BVCU blob and initializing the
+pyttsx3/eSpeak engine is done once per (voices_dir, language) pair; later
+requests for the same pair reuse the already-loaded data.
+
+_load_bundle memoizes only the voice files of a directory, keyed by its
+real path and modification time, so new instances can share them.
+"""
+
+import dataclasses
+import functools
+import os
+from types import MappingProxyType
+
+from text_to_speech import BVCUTextToSpeech
+
+
+@dataclasses.dataclass(frozen=True)
+class VoiceBundle:
+    """Voice files detected in a directory and the blobs selected from them
+    
+    Both mappings are read-only views; pass them to BVCUTextToSpeech as
+    _preloaded_blobs to build an instance without scanning the directory.
+    """
+    voice_files: MappingProxyType
+    bvcu_data: MappingProxyType
+
+
+@functools.lru_cache(maxsize=8)
+def _load_bundle(voice_path, dir_mtime_ns):
+    """Scan voice_path once per (real path, directory mtime) pair
+    
+    dir_mtime_ns is only part of the cache key: adding, removing or
+    replacing a file changes the directory's mtime and therefore loads a new
+    bundle. Files rewritten in place are not noticed.
+    """
+    tts = BVCUTextToSpeech(voice_path, lazy_engine=True)
+    bvcu_data = dict(tts.bvcu_data)
+    bvcu_data['configuration'] = MappingProxyType(bvcu_data['configuration'])
+    return VoiceBundle(MappingProxyType(tts.voice_files), MappingProxyType(bvcu_data))
+
+
+def _bundle_for(voices_dir):
+    """Return the cached VoiceBundle for voices_dir as it is now on disk"""
+    voice_path = os.path.realpath(voices_dir)
+    try:
+        dir_mtime_ns = os.stat(voice_path).st_mtime_ns
+    except OSError:
+        dir_mtime_ns = None
+    return _load_bundle(voice_path, dir_mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_tts(voices_dir, language, lazy_engine):
+    """Return the shared, fully loaded instance for (voices_dir, language)"""
+    return BVCUTextToSpeech(voices_dir, language, lazy_engine=lazy_engine)
+
+
+def _get_tts(voices_dir, language='fr', lazy_engine=False):
+    """
+    Return a BVCUTextToSpeech instance without re-reading the voice files
+
+    The first call for a given (voices_dir, language) pair loads everything;
+    subsequent calls return that same cached instance.
+
+    Args:
+        voices_dir (str): Path to directory containing voice files
+        language (str): Language code for synthesis (default: 'fr' for French)
+        lazy_engine (bool): Defer engine initialization until first use
+
+    Returns:
+        BVCUTextToSpeech: The cached instance
+    """
+    if voices_dir is not None:
+        voices_dir = str(voices_dir)
+    return _cached_tts(voices_dir, language, lazy_engine)
+
+
+def _clone_tts(voices_dir, language='fr', lazy_engine=False):
+    """
+    Return a new BVCUTextToSpeech sharing the cached voice files of voices_dir
+    
+    Use this instead of _get_tts when the caller needs its own instance (for
+    example to change attributes) but not a fresh read of the voice files.
+    The directory is scanned again only when its modification time changes
+    (see _load_bundle).
+    """
+    if voices_dir is None:
+        return BVCUTextToSpeech(None, language, lazy_engine=lazy_engine)
+    bundle = _bundle_for(voices_dir)
+    return BVCUTextToSpeech(
+        voices_dir, language, lazy_engine=lazy_engine,
+        _preloaded_blobs=(bundle.voice_files, bundle.bvcu_data)
+    )